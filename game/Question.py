@@ -1,14 +1,24 @@
 import pygame
-from typing import Dict, List, Tuple
+import sys
+from typing import Iterable, Tuple
+from assets import question_images
 class Question:
-    def __init__(self, question: str, image_path: str, options: List[str], correct_answer: str, category: str):
+    # Sin __dict__ por instancia: con bancos de 100k preguntas cada byte cuenta
+    __slots__ = ("question", "image_path", "options", "correct_answer", "category")
+
+    def __init__(self, question: str, image_path: str, options: Iterable[str], correct_answer: str, category: str):
         self.question = question
-        self.image_path = image_path
-        self.options = options
-        self.correct_answer = correct_answer
-        self.category = category
-        self.image = pygame.image.load(image_path)
-        self.image = pygame.transform.scale(self.image, (200, 200))
-        
-        def __str__(self):
-            return f"Pregunta: {self.question}, Opciones: {self.options}, Respuesta Correcta: {self.correct_answer}, Categoría: {self.category}"
\ No newline at end of file
+        # Rutas, opciones y categorias se repiten entre preguntas: se internan
+        # para que todas compartan el mismo objeto str
+        self.image_path = sys.intern(image_path)
+        self.options: Tuple[str, ...] = tuple(sys.intern(option) for option in options)
+        self.correct_answer = sys.intern(correct_answer)
+        self.category = sys.intern(category)
+
+    def __str__(self):
+        return f"Pregunta: {self.question}, Opciones: {list(self.options)}, Respuesta Correcta: {self.correct_answer}, Categoría: {self.category}"
+
+    @property
+    def image(self) -> pygame.Surface:
+        # La imagen se carga al primer acceso y se comparte entre preguntas
+        return question_images.get(self.image_path)
@@ -0,0 +1,120 @@
+import pygame
+import queue
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+
+class AssetManager:
+    """Carga perezosa de imagenes escaladas con cache LRU limitada por memoria.
+
+    Varias preguntas con el mismo image_path comparten la misma Surface.
+    prefetch() decodifica y escala la imagen en un hilo aparte para que
+    get() la encuentre lista cuando se necesite.
+    """
+
+    def __init__(self, size: Tuple[int, int] = (200, 200), max_bytes: int = 32 * 1024 * 1024):
+        self.size = size
+        self.max_bytes = max_bytes
+        self.surfaces: "OrderedDict[str, pygame.Surface]" = OrderedDict()
+        self.bytes = 0
+        self.lock = threading.Lock()
+        self.pending: Dict[str, threading.Event] = {}
+        self.requests: "queue.Queue[str]" = queue.Queue()
+        self.worker: Optional[threading.Thread] = None
+        # Bundle precompilado (bundle.py); si contiene la imagen no hay que decodificarla
+        self.bundle = None
+
+        # Contadores
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.prefetched = 0
+
+    def get(self, path: str) -> pygame.Surface:
+        """Devuelve la imagen escalada, cargandola si no esta en la cache"""
+        with self.lock:
+            surface = self.surfaces.get(path)
+            if surface is not None:
+                self.hits += 1
+                self.surfaces.move_to_end(path)
+                return surface
+            event = self.pending.get(path)
+
+        # Si el hilo ya la esta cargando, esperamos en lugar de duplicar el trabajo
+        if event is not None:
+            event.wait()
+            with self.lock:
+                surface = self.surfaces.get(path)
+                if surface is not None:
+                    self.hits += 1
+                    self.surfaces.move_to_end(path)
+                    return surface
+
+        surface = self.load(path)
+        with self.lock:
+            self.misses += 1
+            self.store(path, surface)
+        return surface
+
+    def prefetch(self, path: str):
+        """Pide al hilo de fondo que prepare la imagen"""
+        with self.lock:
+            if path in self.surfaces or path in self.pending:
+                return
+            self.pending[path] = threading.Event()
+            if self.worker is None:
+                self.worker = threading.Thread(target=self.work, name="asset-prefetch", daemon=True)
+                self.worker.start()
+        self.requests.put(path)
+
+    def load(self, path: str) -> pygame.Surface:
+        if self.bundle is not None and path in self.bundle:
+            if self.bundle.entries[path]["scaled"] == list(self.size):
+                return self.bundle.surface(path)
+        return pygame.transform.scale(pygame.image.load(path), self.size)
+
+    def store(self, path: str, surface: pygame.Surface):
+        """Guarda la Surface y desaloja las menos usadas (requiere el lock)"""
+        if path in self.surfaces:
+            return
+        self.surfaces[path] = surface
+        self.bytes += self.surface_bytes(surface)
+        while self.bytes > self.max_bytes and len(self.surfaces) > 1:
+            _, old = self.surfaces.popitem(last=False)
+            self.bytes -= self.surface_bytes(old)
+            self.evictions += 1
+
+    def work(self):
+        while True:
+            path = self.requests.get()
+            try:
+                surface = self.load(path)
+            except (pygame.error, FileNotFoundError):
+                # get() volvera a intentarlo y mostrara el error en el hilo principal
+                surface = None
+            with self.lock:
+                if surface is not None:
+                    self.store(path, surface)
+                    self.prefetched += 1
+                self.pending.pop(path).set()
+
+    @staticmethod
+    def surface_bytes(surface: pygame.Surface) -> int:
+        # Con el ancho y no con get_pitch(): una subsurface del atlas tiene el pitch de toda la hoja
+        return surface.get_width() * surface.get_height() * surface.get_bytesize()
+
+    def stats(self) -> Dict[str, int]:
+        with self.lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "prefetched": self.prefetched,
+                "images": len(self.surfaces),
+                "bytes": self.bytes,
+            }
+
+
+# Imagenes de las preguntas, compartidas por todo el proceso
+question_images = AssetManager((200, 200))
@@ -0,0 +1,60 @@
+from typing import List, Tuple
+
+# Tamaño maximo de cada hoja del atlas
+SHEET_SIZE = (2048, 2048)
+
+# (hoja, x, y) de cada imagen dentro del atlas
+Place = Tuple[int, int, int]
+
+
+def pack(sizes: List[Tuple[int, int]], max_size: Tuple[int, int] = SHEET_SIZE) -> Tuple[List[Place], List[Tuple[int, int]]]:
+    """Ubica rectangulos en hojas por estantes (de mas alto a mas bajo).
+
+    Devuelve la posicion de cada rectangulo, en el orden recibido, y el
+    tamaño final de cada hoja (recortado a lo que realmente se usa). Un
+    rectangulo mas grande que max_size va solo en su propia hoja.
+    """
+    max_w, max_h = max_size
+    places: List[Place] = [(0, 0, 0)] * len(sizes)
+    sheets: List[List[int]] = []  # [ancho usado, alto usado]
+    # Estante abierto en la ultima hoja: y, x libre y alto
+    shelf_y = shelf_x = shelf_h = 0
+
+    order = sorted(range(len(sizes)), key=lambda i: (-sizes[i][1], -sizes[i][0]))
+    for i in order:
+        w, h = sizes[i]
+        if w > max_w or h > max_h:
+            places[i] = (len(sheets), 0, 0)
+            sheets.append([w, h])
+            # La hoja grande queda cerrada; se abre una nueva para lo que siga
+            shelf_y, shelf_x, shelf_h = max_h, 0, 0
+            continue
+        if not sheets or shelf_x + w > max_w:
+            # Estante nuevo debajo del actual
+            shelf_y, shelf_x, shelf_h = shelf_y + shelf_h, 0, h
+        if not sheets or shelf_y + h > max_h:
+            sheets.append([0, 0])
+            shelf_y, shelf_x, shelf_h = 0, 0, h
+        sheet = sheets[-1]
+        places[i] = (len(sheets) - 1, shelf_x, shelf_y)
+        shelf_x += w
+        sheet[0] = max(sheet[0], shelf_x)
+        sheet[1] = max(sheet[1], shelf_y + h)
+    return places, [(w, h) for w, h in sheets]
+
+
+def compose_sheet(size: Tuple[int, int], images: List[Tuple[bytes, int, int, int, int]]) -> bytes:
+    """Copia los pixeles de cada imagen (x, y, ancho, alto) en una hoja de 4 bytes por pixel.
+
+    Se copian filas de bytes en lugar de hacer blit para no mezclar el
+    canal alfa con el fondo de la hoja.
+    """
+    width, height = size
+    stride = width * 4
+    sheet = bytearray(stride * height)
+    for data, x, y, w, h in images:
+        row = w * 4
+        for r in range(h):
+            start = (y + r) * stride + x * 4
+            sheet[start:start + row] = data[r * row:(r + 1) * row]
+    return bytes(sheet)
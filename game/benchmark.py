@@ -0,0 +1,147 @@
+"""Benchmark del loop del juego en modo headless.
+
+    python benchmark.py                          # bancos de 50, 5000 y 100000 preguntas
+    python benchmark.py --sizes 50 5000 --frames 3000 --json resultados.json
+
+Cada tamaño de banco corre en un proceso aparte para que el pico de memoria
+(RSS) de uno no contamine al siguiente.
+"""
+import headless
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+DEFAULT_SIZES = [50, 5000, 100000]
+
+
+def make_bank(size: int, path: str, source: str = 'questions.JSON'):
+    """Genera un banco sintetico repitiendo las preguntas de questions.JSON"""
+    with open(source, 'r', encoding='utf-8') as file:
+        base = json.load(file)['questions']
+    with open(path, 'w', encoding='utf-8') as file:
+        file.write('{"questions": [\n')
+        for i in range(size):
+            q = dict(base[i % len(base)])
+            q['question'] = f"{q['question']} #{i}"
+            file.write(json.dumps(q, ensure_ascii=False))
+            file.write(",\n" if i < size - 1 else "\n")
+        file.write("]}\n")
+
+
+def percentile(values: List[float], p: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def peak_rss_mb() -> Optional[float]:
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux lo da en KB y macOS en bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def run_size(size: int, frames: int, questions: Optional[int], seed: int) -> Dict[str, float]:
+    """Mide un banco de `size` preguntas dentro de este proceso"""
+    from gui import Game
+
+    with tempfile.TemporaryDirectory() as tmp:
+        bank = os.path.join(tmp, f"bank_{size}.JSON")
+        make_bank(size, bank)
+
+        # En frío se valida e indexa el banco; en caliente solo se lee el indice
+        start = time.perf_counter()
+        scores = os.path.join(tmp, "scores.log")
+        Game(bank, headless.ScriptedInput(headless.QuizBot(seed)), scores_path=scores).wait_for_bank()
+        startup_cold = time.perf_counter() - start
+
+        # El banco se carga en segundo plano: el arranque cuenta hasta que esta listo
+        source = headless.ScriptedInput(headless.QuizBot(seed), max_frames=frames, max_questions=questions)
+        start = time.perf_counter()
+        game = Game(bank, source, scores_path=scores)
+        game.wait_for_bank()
+        startup_warm = time.perf_counter() - start
+        source.game = game
+
+        start = time.perf_counter()
+        game.run()
+        elapsed = time.perf_counter() - start
+
+    times = [t * 1000 for t in source.frame_times]
+    return {
+        "size": size,
+        "frames": source.frame,
+        "questions": source.questions_seen,
+        "fps": source.frame / elapsed if elapsed else 0.0,
+        "frame_p50_ms": percentile(times, 50),
+        "frame_p90_ms": percentile(times, 90),
+        "frame_p99_ms": percentile(times, 99),
+        "frame_max_ms": max(times) if times else 0.0,
+        "startup_cold_ms": startup_cold * 1000,
+        "startup_warm_ms": startup_warm * 1000,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+COLUMNS = [
+    ("size", "preguntas", "{:>10}"),
+    ("fps", "fps", "{:>10.0f}"),
+    ("frame_p50_ms", "p50 ms", "{:>10.3f}"),
+    ("frame_p90_ms", "p90 ms", "{:>10.3f}"),
+    ("frame_p99_ms", "p99 ms", "{:>10.3f}"),
+    ("startup_cold_ms", "frio ms", "{:>10.1f}"),
+    ("startup_warm_ms", "inicio ms", "{:>10.1f}"),
+    ("peak_rss_mb", "RSS MB", "{:>10.1f}"),
+]
+
+
+def print_table(results: List[Dict[str, float]]):
+    print(" ".join(f"{title:>10}" for _, title, _ in COLUMNS))
+    for result in results:
+        values = [result[key] if result[key] is not None else float("nan") for key, _, _ in COLUMNS]
+        print(" ".join(fmt.format(value) for (_, _, fmt), value in zip(COLUMNS, values)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark headless de Exploradores del mundo")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--frames", type=int, default=2000)
+    parser.add_argument("--questions", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="guarda los resultados en este archivo")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        result = run_size(args.sizes[0], args.frames, args.questions, args.seed)
+        print(json.dumps(result))
+        return
+
+    results = []
+    for size in args.sizes:
+        command = [sys.executable, os.path.abspath(__file__), "--child", "--sizes", str(size),
+                   "--frames", str(args.frames), "--seed", str(args.seed)]
+        if args.questions is not None:
+            command += ["--questions", str(args.questions)]
+        output = subprocess.run(command, check=True, capture_output=True, text=True).stdout
+        results.append(json.loads(output.strip().splitlines()[-1]))
+
+    print_table(results)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as file:
+            json.dump(results, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
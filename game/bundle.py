@@ -0,0 +1,269 @@
+import pygame
+import json
+import mmap
+import os
+import struct
+import sys
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from atlas import compose_sheet, pack
+from question_store import file_hash, iter_json_questions
+
+# Archivo generado con: python bundle.py
+BUNDLE_PATH = "assets.bundle"
+QUESTIONS_PATH = "questions.JSON"
+BACKGROUND_PATH = "toky.jpg"
+IMAGE_SIZE = (200, 200)
+# Fondos para Button(image=...); van al atlas con su tamaño original
+BUTTON_IMAGES: List[str] = []
+
+MAGIC = b"PGQB"
+VERSION = 2
+# Orden de bytes de ARGB8888 (con alfa). frombuffer no tiene un formato sin
+# alfa igual al de la pantalla (XRGB8888), asi que las hojas opacas se
+# convierten una vez al primer uso
+PIXEL_FORMAT = "BGRA"
+HEADER = struct.Struct("<4sII")
+ALIGN = 64
+
+# (ruta, tamaño final o None para conservar el original)
+Source = Tuple[str, Optional[Tuple[int, int]]]
+
+
+def bank_images(questions_path: str = QUESTIONS_PATH) -> List[str]:
+    """Rutas de imagen de las preguntas, sin repetir (recorre todo el banco)"""
+    images: Dict[str, None] = {}
+    with open(questions_path, 'r', encoding='utf-8') as file:
+        if questions_path.lower().endswith(".jsonl"):
+            items = (json.loads(line) for line in file if line.strip())
+        else:
+            items = iter_json_questions(file)
+        for q in items:
+            images[q['image_path']] = None
+    return list(images)
+
+
+def bank_identity(questions_path: str = QUESTIONS_PATH) -> List[int]:
+    """Tamaño y fecha del banco: si no cambian, sus imagenes son las mismas"""
+    stat = os.stat(questions_path)
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def bundle_sources(questions_path: str = QUESTIONS_PATH, images: Optional[List[str]] = None) -> List[Source]:
+    """Imagenes que van en el bundle: las de las preguntas y el fondo del menu"""
+    if images is None:
+        images = bank_images(questions_path)
+    sources: List[Source] = [(path, IMAGE_SIZE) for path in images if os.path.exists(path)]
+    sources.extend((path, None) for path in BUTTON_IMAGES if os.path.exists(path))
+    sources.append((BACKGROUND_PATH, None))
+    return sources
+
+
+def build_bundle(sources: List[Source], bundle_path: str = BUNDLE_PATH, bank: Optional[dict] = None):
+    """Decodifica, escala y empaqueta todas las imagenes en hojas de atlas.
+
+    bank guarda la identidad del banco y las rutas de sus imagenes, asi al
+    abrir no hace falta recorrer el banco si no cambio.
+    """
+    entries: Dict[str, dict] = {}
+    pixels: Dict[str, bytes] = {}
+    for path, size in sources:
+        image = pygame.image.load(path)
+        if size is not None:
+            image = pygame.transform.scale(image, size)
+        pixels[path] = pygame.image.tobytes(image, PIXEL_FORMAT)
+        stat = os.stat(path)
+        entries[path] = {
+            "width": image.get_width(),
+            "height": image.get_height(),
+            "alpha": bool(image.get_flags() & pygame.SRCALPHA),
+            "scaled": list(size) if size is not None else None,
+            "sha1": file_hash(path),
+            "bytes": stat.st_size,
+            "mtime": stat.st_mtime_ns,
+        }
+
+    # Las imagenes opacas y las con alfa van en hojas distintas: las opacas
+    # se convierten al formato de la pantalla y se dibujan sin mezclar alfa
+    sheets: List[dict] = []
+    blobs: List[bytes] = []
+    offset = 0
+    for alpha in (False, True):
+        paths = [path for path, entry in entries.items() if entry["alpha"] == alpha]
+        places, sizes = pack([(entries[p]["width"], entries[p]["height"]) for p in paths])
+        first = len(sheets)
+        contents: List[list] = [[] for _ in sizes]
+        for path, (sheet, x, y) in zip(paths, places):
+            entry = entries[path]
+            entry.update(sheet=first + sheet, x=x, y=y)
+            contents[sheet].append((pixels[path], x, y, entry["width"], entry["height"]))
+        for size, images in zip(sizes, contents):
+            data = compose_sheet(size, images)
+            sheets.append({"offset": offset, "width": size[0], "height": size[1], "alpha": alpha})
+            padding = -len(data) % ALIGN
+            blobs.append(data + b"\0" * padding)
+            offset += len(data) + padding
+
+    header = json.dumps({"format": PIXEL_FORMAT, "sheets": sheets, "entries": entries,
+                         "bank": bank}).encode("utf-8")
+    header += b" " * (-(HEADER.size + len(header)) % ALIGN)
+
+    # Se escribe a un temporal para no dejar un bundle a medias
+    tmp_path = bundle_path + ".tmp"
+    with open(tmp_path, 'wb') as file:
+        file.write(HEADER.pack(MAGIC, VERSION, len(header)))
+        file.write(header)
+        for blob in blobs:
+            file.write(blob)
+    os.replace(tmp_path, bundle_path)
+
+
+class AssetBundle:
+    """Bundle mapeado en memoria con las imagenes empaquetadas en hojas de atlas.
+
+    Cada hoja es una sola Surface; una imagen es un rectangulo de una hoja.
+    Las hojas con alfa se usan directo sobre el mapa. Las opacas se copian
+    una vez con convert() (el blit desde BGRA mezcla alfa y es unas 5 veces
+    mas lento). surface() devuelve una subsurface que comparte los pixeles
+    de la hoja, asi dibujarla es un blit desde el atlas.
+    """
+
+    def __init__(self, bundle_path: str = BUNDLE_PATH):
+        self.path = bundle_path
+        self.file = open(bundle_path, 'rb')
+        try:
+            self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, version, header_size = HEADER.unpack_from(self.map, 0)
+            if magic != MAGIC or version != VERSION:
+                raise ValueError(f"{bundle_path} no es un bundle valido")
+            header = json.loads(bytes(self.map[HEADER.size:HEADER.size + header_size]))
+        except Exception:
+            self.close()
+            raise
+        self.entries: Dict[str, dict] = header["entries"]
+        self.sheet_info: List[dict] = header["sheets"]
+        # Identidad del banco e imagenes de sus preguntas al generar el bundle
+        self.bank: Optional[dict] = header.get("bank")
+        self.sheets: List[Optional[pygame.Surface]] = [None] * len(self.sheet_info)
+        # El hilo de precarga de imagenes tambien pide hojas
+        self.lock = threading.Lock()
+        self.data_start = HEADER.size + header_size
+        self.view = memoryview(self.map)
+
+    def __contains__(self, path: str) -> bool:
+        return path in self.entries
+
+    def is_current(self, sources: List[Source]) -> bool:
+        """Comprueba que cada imagen siga igual (por hash de su contenido)"""
+        for path, size in sources:
+            entry = self.entries.get(path)
+            if entry is None or entry["scaled"] != (list(size) if size is not None else None):
+                return False
+            try:
+                stat = os.stat(path)
+            except OSError:
+                return False
+            # Si tamaño y fecha coinciden no hace falta leer el archivo
+            if stat.st_size == entry["bytes"] and stat.st_mtime_ns == entry["mtime"]:
+                continue
+            if file_hash(path) != entry["sha1"]:
+                return False
+        return True
+
+    def sheet(self, index: int) -> pygame.Surface:
+        """Hoja del atlas (se crea sobre el mapa al primer uso)"""
+        sheet = self.sheets[index]
+        if sheet is not None:
+            return sheet
+        with self.lock:
+            sheet = self.sheets[index]
+            if sheet is None:
+                info = self.sheet_info[index]
+                size = (info["width"], info["height"])
+                start = self.data_start + info["offset"]
+                sheet = pygame.image.frombuffer(self.view[start:start + size[0] * size[1] * 4], size, PIXEL_FORMAT)
+                if not info["alpha"] and pygame.display.get_surface() is not None:
+                    # Hoja opaca: copia en el formato de la pantalla para que el blit sea directo
+                    sheet = sheet.convert()
+                self.sheets[index] = sheet
+        return sheet
+
+    def region(self, path: str) -> Tuple[pygame.Surface, pygame.Rect]:
+        """Hoja y rectangulo de una imagen, para blit(hoja, destino, rect)"""
+        entry = self.entries[path]
+        return self.sheet(entry["sheet"]), pygame.Rect(entry["x"], entry["y"], entry["width"], entry["height"])
+
+    def surface(self, path: str) -> pygame.Surface:
+        sheet, rect = self.region(path)
+        return sheet.subsurface(rect)
+
+    def close(self):
+        """Cierra el archivo y el mapa (en Windows no se puede reemplazar un archivo mapeado)"""
+        self.file.close()
+        self.sheets = [None] * len(getattr(self, "sheet_info", []))
+        try:
+            if hasattr(self, "view"):
+                self.view.release()
+            if hasattr(self, "map"):
+                self.map.close()
+        except BufferError:
+            # Alguna Surface con alfa sigue leyendo del mapa: queda abierto hasta que se libere
+            pass
+
+
+def try_bundle(bundle_path: str = BUNDLE_PATH) -> Optional[AssetBundle]:
+    """Abre el bundle sin verificarlo contra el banco (None si no hay uno valido)"""
+    try:
+        return AssetBundle(bundle_path)
+    except (OSError, ValueError, struct.error):
+        return None
+
+
+def open_bundle(bundle_path: str = BUNDLE_PATH, questions_path: str = QUESTIONS_PATH,
+                rebuild: bool = True, bundle: Optional[AssetBundle] = None) -> Optional[AssetBundle]:
+    """Abre el bundle (o verifica el ya abierto), reconstruyendolo si alguna imagen cambio"""
+    if bundle is None:
+        bundle = try_bundle(bundle_path)
+    try:
+        identity = bank_identity(questions_path)
+        known = bundle is not None and bool(bundle.bank) and bundle.bank["identity"] == identity
+        if known:
+            # El banco no cambio: las rutas de sus imagenes ya estan en el bundle
+            images = bundle.bank["images"]
+        else:
+            images = bank_images(questions_path)
+        sources = bundle_sources(questions_path, images)
+    except (FileNotFoundError, ValueError, KeyError):
+        return None
+
+    # Si el banco cambio se regenera aunque las imagenes sean las mismas, para
+    # guardar su nueva identidad y no volver a recorrerlo en cada arranque
+    if known and bundle.is_current(sources):
+        return bundle
+
+    if bundle is not None:
+        bundle.close()
+    if not rebuild:
+        return None
+    try:
+        build_bundle(sources, bundle_path, {"identity": identity, "images": images})
+        return AssetBundle(bundle_path)
+    except (OSError, pygame.error) as e:
+        print(f"No se pudo generar {bundle_path}: {e}")
+        return None
+
+
+def main():
+    questions_path = sys.argv[1] if len(sys.argv) > 1 else QUESTIONS_PATH
+    images = bank_images(questions_path)
+    sources = bundle_sources(questions_path, images)
+    build_bundle(sources, bank={"identity": bank_identity(questions_path), "images": images})
+    bundle = AssetBundle(BUNDLE_PATH)
+    print(f"{BUNDLE_PATH}: {len(sources)} imagenes en {len(bundle.sheets)} hojas, "
+          f"{os.path.getsize(BUNDLE_PATH)} bytes")
+    bundle.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,7 @@
 import pygame
+from typing import Optional
+from fonts import render_text
+from text_layout import TextStyle, text_layout
 # Colores (RGB)
 PURPLE = (147, 112, 219)
 AQUA = (127, 255, 212)
@@ -9,70 +12,103 @@ RED = (255, 0, 0)
 BLUE = (0, 0, 255)
 GREEN = (0, 255, 0)  # Color verde para respuestas correctas
 class Button:
-    def __init__(self, x: int, y: int, width: int, height: int,text,base_color,hovering_color,font, image):
+    def __init__(self, x: int, y: int, width: int, height: int,text,base_color,hovering_color,font, image,
+                 style: Optional[TextStyle] = None):
         #en caso de que el boton tenga imagen de fondo
-        self.image = image
+        self.background = image
         self.x_pos = x
         self.y_pos = y
-        
-        self.rect = pygame.Rect(x, y, width, height)
-        self.text = text
+        # Con estilo, el texto se ajusta (y parte en lineas) a una caja fija de width x height
+        self.style = style
+        self.width = width
+        self.height = height
 
         #color base y color de hooving (mouse encima del boton)
         self.base_color, self.hovering_color = base_color, hovering_color
-       
+
         self.font = font
-        self.textd = self.font.render(self.text, True, self.base_color)
-       
-        if self.image is None:
-            self.image = self.textd
-            
         self.radius = 20
         self.is_hovered = False
-        
+        self.text = None
+        self.relabel(text)
+
+    def relabel(self, text: str):
+        """Cambia el texto del boton y vuelve a pre-renderizar sus superficies"""
+        if text == self.text:
+            return
+        self.text = text
+
         #contorno o hitbox del boton creado para comprobar clicks
-        self.rect = self.image.get_rect(center=(self.x_pos, self.y_pos))
-        self.textd_rect = self.textd.get_rect(center=(self.x_pos, self.y_pos))
+        if self.style is not None:
+            # Botones de respuesta: se dibujan con draw(), asi que el texto en color
+            # base y hover solo se renderiza si alguien llama a draw_text()
+            self.text_base = self.text_hover = None
+            self.image = self.background
+            self.rect = pygame.Rect(0, 0, self.width, self.height)
+            self.rect.center = (self.x_pos, self.y_pos)
+            self.textd_rect = self.rect
+        else:
+            # Texto en color base y en color hover (botones del menu)
+            self.render_labels()
+            self.image = self.background if self.background is not None else self.text_base
+            self.rect = self.image.get_rect(center=(self.x_pos, self.y_pos))
 
-    def draw(self, screen: pygame.Surface):
-        color = RED if self.is_hovered else PINK  # Cambiado a rosa/rojo
+        # Caja rosa/roja con el texto (botones de respuesta); se crea al primer draw()
+        self.box_base = None
+        self.box_hover = None
+        self.needs_redraw = True
 
-        pygame.draw.rect(screen, color, self.rect, border_radius=self.radius)
-        text_surface = self.font.render(self.text, True, BLACK)
-        text_rect = text_surface.get_rect(center=self.rect.center)
-        screen.blit(text_surface, text_rect)
+    def render_labels(self):
+        self.text_base = self.render_label(self.base_color)
+        self.text_hover = self.render_label(self.hovering_color)
+        self.textd_rect = self.text_base.get_rect(center=(self.x_pos, self.y_pos))
 
-    def update_hover(self, mouse_pos):
-        self.is_hovered = self.rect.collidepoint(mouse_pos)
-        
-    def checkForInput(self, screen):
-        action = False
-        # obtenemos constantemente la posicion del mouse en ventana
-        position = pygame.mouse.get_pos()
+    def render_label(self, color) -> pygame.Surface:
+        """Texto del boton; con estilo se ajusta a la caja dejando un margen"""
+        if self.style is None:
+            return render_text(self.font, self.text, color)
+        margin = self.radius // 2
+        return text_layout.render(self.text, (self.width - 2 * margin, self.height - margin), self.style, color)
 
-        #cambia color si se sobrepone el cursor en el boton
-        if position[0] in range(self.rect.left, self.rect.right) and position[1] in range(self.rect.top, self.rect.bottom):
-            # Si las coordenadas del mouse están dentro del rectángulo definido por self.rect,
-            # cambia el color del texto a self.hovering_color.
-            self.textd = self.font.render(self.text, True, self.hovering_color)
-        else:
-                # Si las coordenadas del mouse no están dentro del rectángulo,
-            # cambia el color del texto a self.base_color.
-            self.textd = self.font.render(self.text, True, self.base_color)
-    
+    def render_box(self, color) -> pygame.Surface:
+        surface = pygame.Surface(self.rect.size, pygame.SRCALPHA)
+        pygame.draw.rect(surface, color, surface.get_rect(), border_radius=self.radius)
+        text_surface = self.render_label(BLACK)
+        surface.blit(text_surface, text_surface.get_rect(center=surface.get_rect().center))
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert_alpha()
+        return surface
+
+    def draw(self, screen: pygame.Surface):
+        if self.box_base is None:
+            self.box_base = self.render_box(PINK)
+            self.box_hover = self.render_box(RED)  # Cambiado a rosa/rojo
+        screen.blit(self.box_hover if self.is_hovered else self.box_base, self.rect)
+        self.needs_redraw = False
+
+    def draw_text(self, screen: pygame.Surface):
+        """Dibuja solo el texto, en color hover si el mouse esta encima"""
+        if self.text_base is None:
+            self.render_labels()
+        if self.background is not None:
+            screen.blit(self.background, self.rect)
+        screen.blit(self.text_hover if self.is_hovered else self.text_base, self.textd_rect)
+        self.needs_redraw = False
 
-        # comprueba si hizo click sobre el boton
-        if self.rect.collidepoint(position):
-            # Verifica si la posición actual del mouse está dentro del rectángulo definido por self.rect.
-            if pygame.mouse.get_pressed()[0] == 1:
-                # Si el botón izquierdo del mouse se presiono y self.clicked es False (es decir, no se ha hecho click previamente),
-                # establece self.clicked en True y action se cambia a True
-                action = True
+    def update_hover(self, mouse_pos) -> bool:
+        """Actualiza el estado hover; devuelve True si cambio"""
+        hovered = self.rect.collidepoint(mouse_pos)
+        if hovered == self.is_hovered:
+            return False
+        self.is_hovered = hovered
+        self.needs_redraw = True
+        return True
 
-        if pygame.mouse.get_pressed()[0] == 0:
-            # Si el botón izquierdo del mouse se presiono, establece self.clicked en False.
-            self.clicked = False
+    def handle_event(self, event: pygame.event.Event) -> bool:
+        """Devuelve True si el evento es un click izquierdo sobre el boton"""
+        if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+            return self.rect.collidepoint(event.pos)
+        return False
 
-        # dibujamos en pantalla
-        screen.blit(self.textd, self.textd_rect)
-        return action
\ No newline at end of file
+    def dirty_rect(self) -> pygame.Rect:
+        return self.rect.union(self.textd_rect)
@@ -0,0 +1,80 @@
+import pygame
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+
+class FontCache:
+    """Registro de fuentes por (ruta, tamaño) y cache LRU de textos renderizados.
+
+    Las superficies devueltas por render() se comparten entre llamadas,
+    por lo que no deben modificarse despues de obtenerlas.
+    """
+
+    def __init__(self, max_texts: int = 256):
+        self.max_texts = max_texts
+        self.fonts: Dict[Tuple[Optional[str], int], pygame.font.Font] = {}
+        self.texts: "OrderedDict[tuple, pygame.Surface]" = OrderedDict()
+
+        # Contadores
+        self.font_hits = 0
+        self.font_misses = 0
+        self.text_hits = 0
+        self.text_misses = 0
+        self.text_evictions = 0
+
+    def get_font(self, path: Optional[str], size: int) -> pygame.font.Font:
+        """Devuelve la fuente (ruta, tamaño), cargandola solo la primera vez"""
+        key = (path, size)
+        font = self.fonts.get(key)
+        if font is None:
+            self.font_misses += 1
+            font = pygame.font.Font(path, size)
+            self.fonts[key] = font
+        else:
+            self.font_hits += 1
+        return font
+
+    def render(self, font: pygame.font.Font, text: str, antialias: bool, color) -> pygame.Surface:
+        """Renderiza el texto o lo reutiliza si ya estaba en la cache"""
+        key = (font, text, antialias, color)
+        surface = self.texts.get(key)
+        if surface is not None:
+            self.text_hits += 1
+            self.texts.move_to_end(key)
+            return surface
+
+        self.text_misses += 1
+        surface = font.render(text, antialias, color)
+        self.texts[key] = surface
+        if len(self.texts) > self.max_texts:
+            self.texts.popitem(last=False)
+            self.text_evictions += 1
+        return surface
+
+    def stats(self) -> Dict[str, int]:
+        """Contadores de aciertos, fallos y desalojos"""
+        return {
+            "font_hits": self.font_hits,
+            "font_misses": self.font_misses,
+            "fonts": len(self.fonts),
+            "text_hits": self.text_hits,
+            "text_misses": self.text_misses,
+            "text_evictions": self.text_evictions,
+            "texts": len(self.texts),
+        }
+
+    def clear(self):
+        """Vacia la cache de textos (las fuentes se conservan)"""
+        self.texts.clear()
+
+
+# Cache compartida por todo el proceso
+font_cache = FontCache()
+
+
+def get_font(size: int, path: Optional[str] = "font.ttf") -> pygame.font.Font:
+    return font_cache.get_font(path, size)
+
+
+def render_text(font: pygame.font.Font, text: str, color, antialias: bool = True) -> pygame.Surface:
+    return font_cache.render(font, text, antialias, color)
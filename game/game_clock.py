@@ -0,0 +1,28 @@
+STEP_MS = 10
+
+
+class GameClock:
+    """Reloj de paso fijo para la logica del juego.
+
+    Cada cuadro se le suma el tiempo real transcurrido y advance() devuelve
+    cuantos pasos de step_ms milisegundos hay que simular. Asi los
+    temporizadores avanzan igual aunque se dibuje a 30, a 15 cuadros por
+    segundo o se salten cuadros: el tiempo que sobra queda acumulado para el
+    cuadro siguiente.
+    """
+
+    def __init__(self, step_ms: int = STEP_MS):
+        self.step_ms = step_ms
+        self.accumulator = 0
+        self.elapsed_ms = 0
+
+    def reset(self):
+        self.accumulator = 0
+
+    def advance(self, frame_ms: int) -> int:
+        """Suma la duracion del cuadro y devuelve los pasos de logica pendientes"""
+        self.accumulator += frame_ms
+        steps = self.accumulator // self.step_ms
+        self.accumulator -= steps * self.step_ms
+        self.elapsed_ms += steps * self.step_ms
+        return int(steps)
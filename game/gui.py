@@ -1,13 +1,27 @@
 import pygame
-import json
 import random
 import os
-from typing import Dict, List, Tuple
+import threading
+from typing import List, Optional, Sequence, Tuple
 from button import Button
+from fonts import font_cache, render_text
       
-from Question import Question
-# Inicialización de Pygame
-pygame.init()
+from assets import question_images
+from bundle import BACKGROUND_PATH, open_bundle, try_bundle
+from question_store import QuestionStore
+from render import DirtyRenderer
+from scheduler import IdleScheduler
+from inputs import PygameInput
+from profiler import profiler
+from game_clock import GameClock
+from overlays import SurfacePool, compose_overlay
+from text_layout import TextStyle, text_layout
+from session import GameSession
+from scores import SCORES_PATH, ScoreStore
+from startup import mark_startup
+# Inicialización de Pygame: solo video y fuentes (el juego no usa audio ni joystick)
+pygame.display.init()
+pygame.font.init()
 
 # Constantes
 WINDOW_WIDTH = 800
@@ -24,355 +38,473 @@ RED = (255, 0, 0)
 BLUE = (0, 0, 255)
 GREEN = (0, 255, 0)  # Color verde para respuestas correctas
 
+# Textos que se ajustan a su caja (text_layout.py)
+QUESTION_RECT = pygame.Rect(40, 85, WINDOW_WIDTH - 80, 90)
+QUESTION_STYLE = TextStyle(None, 40, min_size=18)
+OPTION_BOX = (180, 60)
+OPTION_STYLE = TextStyle("font.ttf", 20, min_size=8)
 
-class Game:
-    def __init__(self):
+
+class Game(GameSession):
+    def __init__(self, questions_path: str = 'questions.JSON', input_source: PygameInput = None,
+                 render_fps: int = FPS, scores_path: Optional[str] = SCORES_PATH,
+                 seed: Optional[int] = None):
         self.screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
         pygame.display.set_caption("Juego Educativo")
+        self.renderer = DirtyRenderer(self.screen)
+        # Overlays compuestos una vez por estado (jugador del turno, ganador)
+        self.overlays = SurfacePool()
         self.clock = pygame.time.Clock()
+        # Los cuadros se dibujan a render_fps; la logica usa su propio reloj de paso fijo
+        self.render_fps = render_fps
+        self.game_clock = GameClock()
+        self.input = input_source or PygameInput()
+        self.questions_path = questions_path
         
-        # Timer
-        self.timer = 5 * FPS  
-        self.current_time = self.timer
-        self.timer_active = False  # Nueva variable para controlar el timer
-        
-        # Jugadores
-        self.player1_score = 0
-        self.player2_score = 0
-        self.current_player = None
-        self.show_turn_announcement = False
-        self.announcement_timer = 0
-        
-        # Mensaje de retroalimentación
-        self.feedback_message = ""
-        self.feedback_color = WHITE
-        self.feedback_timer = 0
+        # Fondo del menu desde el bundle ya generado, sin esperar a verificarlo
+        # contra el banco; eso lo hace el hilo de carga
+        self.bundle = try_bundle()
+        self.background = self.load_background()
         
         # Botones
         self.buttons = []
+        self.button_pool: List[Button] = []
         self.update_buttons([])
         
-        #Cargar preguntas
-        self.questions = self.load_questions()
-        self.selected_questions = []
-        self.current_question = None
+        # Las reglas de la partida viven en GameSession; el banco y la tabla de
+        # puntajes llegan despues, desde el hilo de carga
+        # Con la misma semilla las preguntas salen en el mismo orden (replay.py)
+        super().__init__([], rng=random.Random(seed))
+        self.scores_path = scores_path
+        self.feedback_color = WHITE
+        self.next_question = None
+        
+        # Pantalla de puntajes: categoria elegida y ultima imagen compuesta
+        self.score_category = 0
+        self.scores_view: Tuple = (None, None)
         
         # Estado del juego
         self.game_state = "menu"
-        self.winner = None
+        self.scheduler = IdleScheduler(self.input)
+        
+        # Preguntas e imagenes se cargan en segundo plano mientras se ve el menu
+        self.bank_ready = threading.Event()
+        self.loaded = None
+        self.loader = threading.Thread(target=self.load_bank, name="bank-loader", daemon=True)
+        self.loader.start()
 
-    def update_buttons(self, options: List[str]):
-        """Actualiza los botones con nuevas opciones"""
-        self.buttons = []
+    def load_bank(self):
+        """Abre (o reconstruye) el bundle, el banco de preguntas y la tabla de puntajes; corre en el hilo de carga"""
+        try:
+            bundle = open_bundle(questions_path=self.questions_path, bundle=self.bundle)
+            self.loaded = (bundle, self.load_questions(), self.load_scores())
+        finally:
+            self.bank_ready.set()
+            mark_startup("bank_ready")
+
+    def wait_for_bank(self):
+        """Espera al hilo de carga y conecta el banco y las imagenes a la partida"""
+        if self.loader is None:
+            return
+        if not self.bank_ready.is_set():
+            pygame.display.set_caption("Cargando preguntas...")
+        self.loader.join()
+        self.loader = None
+        if self.loaded is None:
+            # El hilo fallo (ya mostro el error): se juega sin preguntas
+            self.loaded = (None, [], None)
+        bundle, questions, self.scores = self.loaded
+        if bundle is not self.bundle:
+            # El hilo regenero el bundle (alguna imagen cambio): el fondo tambien puede haber cambiado
+            self.bundle = bundle
+            self.background = self.load_background()
+            self.scheduler.request_redraw()
+        question_images.bundle = self.bundle
+        self.set_questions(questions)
+
+    def update_buttons(self, options: Sequence[str]):
+        """Actualiza los botones con nuevas opciones (reutilizando los ya creados)"""
         button_width = 100
-        button_height = 50
         spacing = (WINDOW_WIDTH - (button_width * 3)) // 5
         for i, option in enumerate(options):
-            x = spacing + (i * (button_width + spacing))
-            self.buttons.append(Button(x, 500, button_width, button_height,text=option,base_color=PINK, hovering_color=RED, font = self.get_font(20), image = None))
+            if i < len(self.button_pool):
+                self.button_pool[i].relabel(option)
+            else:
+                x = spacing + (i * (button_width + spacing))
+                # Caja fija; las opciones largas se parten en lineas o se achican
+                self.button_pool.append(Button(x, 500, OPTION_BOX[0], OPTION_BOX[1], text=option, base_color=PINK, hovering_color=RED,
+                                               font=self.get_font(20), image=None, style=OPTION_STYLE))
+        self.buttons = self.button_pool[:len(options)]
+
+    def draw_menu_screen(self, buttons: List[Button], paint_background, full: bool):
+        """Dibuja una pantalla de menu; si no es completa, solo los botones que cambiaron"""
+        mouse_pos = self.input.mouse_pos()
+        for button in buttons:
+            button.update_hover(mouse_pos)
+        if full:
+            paint_background()
+            for button in buttons:
+                button.draw_text(self.screen)
+            pygame.display.update()
+            return
+        dirty = []
+        for button in buttons:
+            if button.needs_redraw:
+                area = button.dirty_rect()
+                self.screen.set_clip(area)
+                paint_background()
+                button.draw_text(self.screen)
+                dirty.append(area)
+        self.screen.set_clip(None)
+        if dirty:
+            pygame.display.update(dirty)
+
+    def paint_menu_background(self):
+        self.screen.blit(self.background, (0,0))
+        self.dibujar_texto("Exploradores del mundo", 30, 420, 100)
+
+    def compose_scores_screen(self, category: Optional[str]) -> pygame.Surface:
+        """Compone la pantalla de puntajes: general, una categoria y estadisticas"""
+        surface = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT))
+        surface.fill(BLACK)
+        title = render_text(self.get_font(30), "PUNTAJES", "#b68f40")
+        surface.blit(title, title.get_rect(center=(WINDOW_WIDTH//2, 50)))
+        
+        font = font_cache.get_font(None, 28)
+        columns = [("General", None, 60)]
+        if category is not None:
+            columns.append((f"< {category} >", category, 430))
+        for header, board, x in columns:
+            surface.blit(render_text(font, header, AQUA), (x, 100))
+            for i, (score, _, player) in enumerate(self.scores.top(10, board), 1):
+                line = render_text(font, f"{i:>2}. Jugador {player}   {score}", WHITE)
+                surface.blit(line, (x, 105 + i * 26))
+        
+        totals = self.scores.totals()
+        small = font_cache.get_font(None, 24)
+        # Cada partida guarda un resultado por jugador
+        summary = [
+            f"{totals['matches'] // 2} partidas   {totals['asked']} preguntas jugadas",
+            f"{totals['answer_rate']:.0%} respondidas   {totals['correct_rate']:.0%} correctas   "
+            f"buzzer en {totals['avg_buzz_ms'] / 1000:.1f} s de media",
+        ]
+        for i, text in enumerate(summary):
+            surface.blit(render_text(small, text, PINK), (60, 400 + i * 24))
+        if category is not None:
+            hint = render_text(small, "Flechas: cambiar categoria", WHITE)
+            surface.blit(hint, hint.get_rect(right=WINDOW_WIDTH - 60, centery=500))
+        return surface.convert()
+    
+    def paint_scores_screen(self):
+        """Pinta la pantalla de puntajes (se recompone solo si cambio algo)"""
+        if self.scores is None:
+            self.screen.fill(BLACK)
+            return
+        categories = self.scores.categories()
+        category = categories[self.score_category % len(categories)] if categories else None
+        key = (category, self.scores.version)
+        if self.scores_view[0] != key:
+            self.scores_view = (key, self.compose_scores_screen(category))
+        self.screen.blit(self.scores_view[1], (0, 0))
+    
+    def load_background(self) -> pygame.Surface:
+        """Carga el fondo del menu, desde el bundle si esta disponible"""
+        if self.bundle is not None and BACKGROUND_PATH in self.bundle:
+            return self.bundle.surface(BACKGROUND_PATH)
+        return pygame.image.load(BACKGROUND_PATH).convert()
 
     def show_feedback(self, is_correct: bool):
         """Muestra mensaje de retroalimentación"""
-        self.feedback_message = "¡Correcto!" if is_correct else "Incorrecto"
+        super().show_feedback(is_correct)
         self.feedback_color = GREEN if is_correct else RED
-        self.feedback_timer = 0.5* FPS  # Mostrar por 2 segundos
     
-    def load_questions(self) -> List[Question]:
-        """Carga las preguntas desde un archivo JSON"""
-        questions = []
+    def load_scores(self) -> Optional[ScoreStore]:
+        """Abre la tabla de puntajes (relee el log si el juego se corto a mitad de una escritura)"""
+        if not self.scores_path:
+            return None
         try:
-            with open('questions.JSON', 'r', encoding='utf-8') as file:
-                data = json.load(file)
-                for q in data['questions']:
-                    print("peta")
-                    questions.append(Question(
-                        q['question'],
-                        q['image_path'],
-                        q['options'],
-                        q['correct_answer'],
-                        q['category']
-                    ))
+            return ScoreStore(self.scores_path)
+        except OSError as error:
+            print(f"No se pudo abrir la tabla de puntajes: {error}")
+            return None
+
+    def load_questions(self) -> QuestionStore:
+        """Abre el banco de preguntas (se valida e indexa solo la primera vez)"""
+        try:
+            return QuestionStore(self.questions_path)
         except FileNotFoundError:
             print("Archivo de preguntas no encontrado")
-    
-        print("qieee")
-        return questions
+            return []
+        except OSError as error:
+            print(f"No se pudo abrir el banco de preguntas: {error}")
+            return []
 
     def select_random_question(self):
         """Selecciona una pregunta aleatoria"""
-        if self.questions:
-            available_questions = [q for q in self.questions if q not in self.selected_questions]
-            if not available_questions:
-                print("No hay más preguntas disponibles")
-                return
-        if self.questions:
-            self.current_question = random.choice(available_questions)
-            self.selected_questions.append(self.current_question)
-            print("hola")
-            self.update_buttons(self.current_question.options)
-            self.current_time = self.timer
-            self.current_player = None
-            self.show_turn_announcement = False
-            self.timer_active = False  # El timer se detiene al cambiar la pregunta
-        
+        super().select_random_question()
+        if self.bank_exhausted:
+            print("No hay más preguntas disponibles")
+
+    def on_question_changed(self):
+        """Prepara los botones y la imagen de la siguiente pregunta"""
+        self.prefetch_next_question()
+        self.update_buttons(self.current_question.options)
+    
+    def prefetch_next_question(self):
+        """Reserva la siguiente pregunta y prepara su imagen en segundo plano"""
+        index = self.selector.peek()
+        self.next_question = self.questions[index] if index is not None else None
+        if self.next_question:
+            question_images.prefetch(self.next_question.image_path)
     
-    def check_answer(self, answer: str,tiempo) -> bool:
-        """Verifica si la respuesta es correcta"""
-        if self.current_question and answer == self.current_question.correct_answer:
-            if self.current_player == 1:
-                self.player1_score += 10
-            else:
-                self.player2_score += 10
-            self.show_feedback(True)
-            return True
-        else:
-            if tiempo >= 105:
-                if self.current_player==1: 
-                    self.player1_score-=5 
-                else: 
-                    self.player2_score-=5
-            
-        self.show_feedback(False)
-        return False
     def dibujar_texto(self,text, size, *pos,color="#b68f40"):
-        draw = self.get_font(size).render(text, True, color)
+        draw = render_text(self.get_font(size), text, color)
         MENU_RECT = draw.get_rect(center=pos)
         self.screen.blit(draw, MENU_RECT)
         
     def get_font(self,size):  # Returns Press-Start-2P in the desired size
-        return pygame.font.Font("font.ttf", size)
+        return font_cache.get_font("font.ttf", size)
+
+    def compose_turn_announcement(self, player: int) -> pygame.Surface:
+        """Compone el anuncio de turno de un jugador (se hace una sola vez)"""
+        font = font_cache.get_font(None, 48)
+        player_color = RED if player == 1 else BLUE
+        
+        text_player = render_text(font, "Jugador", player_color)
+        text_number = render_text(font, str(player), player_color)
+        
+        # Semi-transparente overlay
+        return compose_overlay((WINDOW_WIDTH, WINDOW_HEIGHT), (255, 255, 255), 128, [
+            (text_player, (WINDOW_WIDTH//2 - 50, WINDOW_HEIGHT//2)),
+            (text_number, (WINDOW_WIDTH//2 + 50, WINDOW_HEIGHT//2)),
+        ])
 
     def draw_turn_announcement(self):
         """Dibuja el anuncio del turno del jugador"""
         if self.show_turn_announcement and self.current_player:
-            # Semi-transparente overlay
-            s = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT))
-            s.set_alpha(128)
-            s.fill((255, 255, 255))
-            self.screen.blit(s, (0,0))
-            
-            font = pygame.font.Font(None, 48)
-            player_color = RED if self.current_player == 1 else BLUE
-            
-            text_player = font.render("Jugador", True, player_color)
-            text_number = font.render(str(self.current_player), True, player_color)
-            
-            text_rect_player = text_player.get_rect(center=(WINDOW_WIDTH//2 - 50, WINDOW_HEIGHT//2))
-            text_rect_number = text_number.get_rect(center=(WINDOW_WIDTH//2 + 50, WINDOW_HEIGHT//2))
-            
-            self.screen.blit(text_player, text_rect_player)
-            self.screen.blit(text_number, text_rect_number)
+            player = self.current_player
+            overlay = self.overlays.get(("turn", player), lambda: self.compose_turn_announcement(player))
+            self.screen.blit(overlay, (0,0))
 
-    def draw_game_over(self):
-        """Dibuja la pantalla de fin de juego"""
-        s = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT))
-        s.set_alpha(128)
-        s.fill((0, 0, 0))
-        self.screen.blit(s, (0,0))
-
-        font = pygame.font.Font(None, 74)
-        if self.winner:
-            text = font.render(f"¡Jugador {self.winner} Gana!", True, RED if self.winner == 1 else BLUE)
+    def compose_game_over(self, winner) -> pygame.Surface:
+        """Compone la pantalla de fin de juego de un ganador (se hace una sola vez)"""
+        font = font_cache.get_font(None, 74)
+        if winner:
+            text = render_text(font, f"¡Jugador {winner} Gana!", RED if winner == 1 else BLUE)
         else:
-            text = font.render("¡Empate!", True, WHITE)
-        
-        text_rect = text.get_rect(center=(WINDOW_WIDTH//2, WINDOW_HEIGHT//2))
-        self.screen.blit(text, text_rect)
+            text = render_text(font, "¡Empate!", WHITE)
 
         # Instrucciones para reiniciar
-        font_small = pygame.font.Font(None, 36)
-        restart_text = font_small.render("Presiona ESPACIO para jugar de nuevo", True, WHITE)
-        restart_rect = restart_text.get_rect(center=(WINDOW_WIDTH//2, WINDOW_HEIGHT//2 + 50))
-        self.screen.blit(restart_text, restart_rect)
-    
-    def draw(self):
-        """Dibuja todos los elementos en pantalla"""
-        # Fondo
-        self.screen.fill(AQUA)
+        font_small = font_cache.get_font(None, 36)
+        restart_text = render_text(font_small, "Presiona ESPACIO para jugar de nuevo", WHITE)
         
-        # Barra superior
-        pygame.draw.rect(self.screen, PURPLE, (0, 0, WINDOW_WIDTH, 60))
-        
-        # Timer bar
-        timer_width = (self.current_time / self.timer) * WINDOW_WIDTH
-        pygame.draw.rect(self.screen, PURPLE, (0, 70, timer_width, 10))
+        return compose_overlay((WINDOW_WIDTH, WINDOW_HEIGHT), (0, 0, 0), 128, [
+            (text, (WINDOW_WIDTH//2, WINDOW_HEIGHT//2)),
+            (restart_text, (WINDOW_WIDTH//2, WINDOW_HEIGHT//2 + 50)),
+        ])
+
+    def draw_game_over(self):
+        """Dibuja la pantalla de fin de juego"""
+        winner = self.winner
+        overlay = self.overlays.get(("game_over", winner), lambda: self.compose_game_over(winner))
+        self.screen.blit(overlay, (0,0))
+    
+    def draw_static(self, surface: pygame.Surface):
+        """Dibuja la capa que solo cambia con la pregunta o el marcador"""
+        with profiler.phase("background"):
+            # Fondo
+            surface.fill(AQUA)
+            
+            # Barra superior
+            pygame.draw.rect(surface, PURPLE, (0, 0, WINDOW_WIDTH, 60))
         
-        # Puntuaciones
-        font = pygame.font.Font(None, 36)
-        score1 = font.render(f"Jugador 1: {self.player1_score}", True, BLACK)
-        score2 = font.render(f"Jugador 2: {self.player2_score}", True, BLACK)
-        self.screen.blit(score1, (50, 20))
-        self.screen.blit(score2, (WINDOW_WIDTH - 200, 20))
+        with profiler.phase("text"):
+            # Puntuaciones
+            font = font_cache.get_font(None, 36)
+            score1 = render_text(font, f"Jugador 1: {self.player1_score}", BLACK)
+            score2 = render_text(font, f"Jugador 2: {self.player2_score}", BLACK)
+            surface.blit(score1, (50, 20))
+            surface.blit(score2, (WINDOW_WIDTH - 200, 20))
         
         if self.current_question:
-            # Pregunta
-            question_font = pygame.font.Font(None, 40)
-            question_text = question_font.render(self.current_question.question, True, BLACK)
-            question_rect = question_text.get_rect(center=(WINDOW_WIDTH//2, 120))
-            self.screen.blit(question_text, question_rect)
+            with profiler.phase("text"):
+                # Pregunta, ajustada al espacio entre el timer y la imagen
+                question_text = text_layout.render(self.current_question.question, QUESTION_RECT.size,
+                                                   QUESTION_STYLE, BLACK)
+                question_rect = question_text.get_rect(center=QUESTION_RECT.center)
+                surface.blit(question_text, question_rect)
             
-            # Imagen
-            image_rect = self.current_question.image.get_rect(center=(WINDOW_WIDTH//2, 280))
-            self.screen.blit(self.current_question.image, image_rect)
-        
-        # Botones
-        mouse_pos = pygame.mouse.get_pos()
-        for button in self.buttons:
-            button.update_hover(mouse_pos)
+            with profiler.phase("image"):
+                # Imagen
+                image_rect = self.current_question.image.get_rect(center=(WINDOW_WIDTH//2, 280))
+                surface.blit(self.current_question.image, image_rect)
+    
+    def draw_button(self, button: Button):
+        with profiler.phase("buttons"):
             button.draw(self.screen)
+    
+    def draw(self):
+        """Dibuja en pantalla solo los elementos que cambiaron"""
+        renderer = self.renderer
+        renderer.set_static((self.current_question, self.player1_score, self.player2_score), self.draw_static)
+        
+        with profiler.phase("background"):
+            # Timer bar
+            timer_rect = pygame.Rect(0, 70, int((self.current_time / self.timer) * WINDOW_WIDTH), 10)
+            renderer.add("timer", timer_rect.width, timer_rect,
+                         lambda: pygame.draw.rect(self.screen, PURPLE, timer_rect))
+        
+        with profiler.phase("buttons"):
+            # Botones
+            mouse_pos = self.input.mouse_pos()
+            for i, button in enumerate(self.buttons):
+                button.update_hover(mouse_pos)
+                renderer.add(f"button{i}", (button.text, button.is_hovered), button.rect,
+                             lambda button=button: self.draw_button(button))
         
-        # Mensaje de retroalimentación
-        if self.feedback_timer > 0:
-            feedback_font = pygame.font.Font(None, 48)
-            feedback_text = feedback_font.render(self.feedback_message, True, self.feedback_color)
-            feedback_rect = feedback_text.get_rect(center=(WINDOW_WIDTH//2, 400))
-            self.screen.blit(feedback_text, feedback_rect)
+        with profiler.phase("text"):
+            # Mensaje de retroalimentación
+            if self.feedback_timer > 0:
+                feedback_font = font_cache.get_font(None, 48)
+                feedback_text = render_text(feedback_font, self.feedback_message, self.feedback_color)
+                feedback_rect = feedback_text.get_rect(center=(WINDOW_WIDTH//2, 400))
+                renderer.add("feedback", (self.feedback_message, self.feedback_color), feedback_rect,
+                             lambda: self.screen.blit(feedback_text, feedback_rect))
         
         # Anuncio de turno
         if self.show_turn_announcement:
-            self.draw_turn_announcement()
-            
-    
+            renderer.add("turn", self.current_player, self.screen.get_rect(), self.draw_turn_announcement)
         
-        pygame.display.flip()
-
-    def reset_game(self):
-        """Reinicia el juego"""
-        self.player1_score = 0
-        self.player2_score = 0
-        self.current_player = None
-        self.game_state = "playing"
-        self.winner = None
-        self.selected_questions = []
+        # Overlay de tiempos por fase (F3)
+        if profiler.show_overlay:
+            renderer.add("profiler", profiler.overlay_version, profiler.overlay_rect(),
+                         lambda: profiler.draw_overlay(self.screen))
         
-    
+        with profiler.phase("flip"):
+            renderer.end_frame()
+
     def run(self):
         """Loop principal del juego"""
         
-        tiempo =0
         running = True
        
         PLAY_BUTTON = Button(400, 250, 50, 100, "JUGAR",base_color="#d7fcd4", hovering_color="White",font=self.get_font(30), image=None)
         QUIT_BUTTON = Button(400, 400, 50,100, text="SALIR", font=self.get_font(30), base_color="#d7fcd4", hovering_color="White", image=None)
         PUNTAJE_BUTTON=Button(400, 325,50,100, text="PUNTAJES", font=self.get_font(30), base_color="#d7fcd4", hovering_color="White",image=None)
         BACK_BUTTON = Button(150, 500,50,100, text="ATRAS", font=self.get_font(30), base_color="White", hovering_color="Green",image=None)
+        menu_buttons = [PLAY_BUTTON, PUNTAJE_BUTTON, QUIT_BUTTON]
+        shown_state = None
+        page_changed = False
+        first_frame = True
         while running:
-            self.screen.fill((0, 0, 0))  # Limpia la pantalla en cada iteración
-            
+            # Al cambiar de pantalla siempre se dibuja el primer cuadro completo
+            entered = self.game_state != shown_state
+            if entered:
+                shown_state = self.game_state
+                self.scheduler.request_redraw()
            
             if self.game_state == "menu":
-                
-                self.screen.blit(pygame.image.load("toky.jpg"), (0,0))
-                pygame.display.set_caption("Menu - Exploradores del mundo")
-                self.dibujar_texto("Exploradores del mundo", 30, 420, 100)
-               
-                #dibujamos boton y comprueba si clckeo el Botón para iniciar a jugar
-                if PLAY_BUTTON.checkForInput(self.screen):
-                    #si es asi, ya no dibuja el menu
-                    print("hizo click")
-                    self.game_state="playing"
-                    self.select_random_question()
-                if PUNTAJE_BUTTON.checkForInput(self.screen):
-                    self.screen.fill(BLACK)
-                    pygame.display.flip()
-                    self.game_state = "puntaje"
-                if QUIT_BUTTON.checkForInput(self.screen):
-                    pygame.quit()
+                background = self.background
+                if self.loader is not None and self.bank_ready.is_set():
+                    # El banco ya cargo: se conecta sin esperar a JUGAR, asi el menu muestra el fondo verificado
+                    self.wait_for_bank()
+                if self.scheduler.needs_redraw():
+                    if entered:
+                        pygame.display.set_caption("Menu - Exploradores del mundo")
+                    self.draw_menu_screen(menu_buttons, self.paint_menu_background,
+                                          entered or self.background is not background)
+                    if first_frame:
+                        first_frame = False
+                        mark_startup("first_frame")
                     
             elif self.game_state == "puntaje":  
-                self.screen.fill(BLACK)
-                pygame.display.set_caption("Puntaje - Exploradores del mundo")
-                if BACK_BUTTON.checkForInput(self.screen):
-                    self.game_state="menu"
+                if self.scheduler.needs_redraw():
+                    if entered:
+                        pygame.display.set_caption("Puntaje - Exploradores del mundo")
+                        if self.scores is not None:
+                            # La ultima partida tiene que estar escrita antes de mostrar la tabla
+                            self.scores.flush()
+                    self.draw_menu_screen([BACK_BUTTON], self.paint_scores_screen, entered or page_changed)
+                    page_changed = False
                    
             elif self.game_state == "playing":
-                while self.game_state=="playing":
-                    self.screen.fill((0, 0, 0)) 
-                    pygame.display.set_caption("Exploradores del mundo")
+                # Venimos de otra pantalla: el primer cuadro se dibuja completo
+                self.renderer.invalidate()
+                pygame.display.set_caption("Exploradores del mundo")
+                # El tiempo pasado en el menu no cuenta para la pregunta
+                self.clock.tick()
+                self.game_clock.reset()
+                frame_ms = 0
+                while running and self.game_state=="playing":
                     #self.screen.blit(pygame.image.load("toky.jpg"), (0, 0))
                     self.draw()
-                    # Solo actualizar el timer si está activo
-                    #if self.timer_active:
-                    self.current_time -= 1
-                    if self.current_time <= 0:
-                        print("nueva pregunta:")
-                        self.select_random_question()
-                
-                    
-                    # Actualizar tiempo de anuncio
-                    if self.show_turn_announcement:
-                        self.announcement_timer -= 1
-                        if self.announcement_timer <= 0:
-                            self.show_turn_announcement = False
-                    
-                    # Actualizar timer de feedback
-                    if self.feedback_timer > 0:
-                        self.feedback_timer -= 1
+                    with profiler.phase("update"):
+                        # La logica avanza en pasos fijos segun el tiempo real del cuadro
+                        self.advance(self.game_clock, frame_ms)
                 
-                    for event in pygame.event.get():
-                        if event.type == pygame.QUIT:
-                            running = False
+                    with profiler.phase("events"):
+                        events = self.input.events()
+                        for event in events:
+                            if event.type == pygame.QUIT:
+                                running = False
+                            if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                                profiler.toggle_overlay()
                         
-                        if self.game_state == "playing":
-                            if event.type == pygame.KEYDOWN:
-                                if event.key == pygame.K_q and self.current_player is None:
-                                    self.current_player = 1
-                                    self.show_turn_announcement = True
-                                    self.announcement_timer = 2 * FPS
-                                    self.timer_active = True  # Activar el timer cuando el jugador 1 toma su turno
-                                elif event.key == pygame.K_RIGHTBRACKET and self.current_player is None:
-                                    self.current_player = 2
-                                    self.show_turn_announcement = True
-                                    self.announcement_timer = 2 * FPS
-                                    self.timer_active = True  # Activar el timer cuando el jugador 2 toma su turno
-                                tiempo = self.current_time
-                                
-                            
+                            if self.game_state == "playing":
+                                if event.type == pygame.KEYDOWN:
+                                    if event.key == pygame.K_q:
+                                        self.buzz(1)
+                                    elif event.key == pygame.K_RIGHTBRACKET:
+                                        self.buzz(2)
                             
-                            if event.type == pygame.MOUSEBUTTONDOWN and self.current_player is not None:
-                                mouse_pos = pygame.mouse.get_pos()
-                                for button in self.buttons:
-                                    if button.rect.collidepoint(mouse_pos):
-                                        correct = self.check_answer(button.text,tiempo)
-                                        
-                                        # Verificar si alguien ganó
-                                        if self.player1_score >= 20 or self.player2_score >= 20:
-                                            self.game_state = "game_over"
-                                            if self.player1_score > self.player2_score:
-                                                self.winner = 1
-                                            elif self.player2_score > self.player1_score:
-                                                self.winner = 2
-                                            else:
-                                                self.winner = None
-                                        else:
-                                            self.select_random_question()
+                                if event.type == pygame.MOUSEBUTTONDOWN and self.current_player is not None:
+                                    for button in self.buttons:
+                                        if button.handle_event(event):
+                                            # Puntaje, condicion de victoria y siguiente pregunta
+                                            self.answer(button.text)
+                                            # Los botones se reutilizan con la nueva pregunta
+                                            break
                     
-                    self.clock.tick(FPS)
+                    profiler.end_frame()
+                    frame_ms = self.input.tick(self.clock, self.render_fps)
             
             elif self.game_state == "game_over":
-                while self.game_state == "game_over":
+                if self.scheduler.needs_redraw():
                     self.screen.fill(PINK)
                     self.dibujar_texto("El ganador es el jugador: " + str(self.winner), 20, 420, 100)
                     self.dibujar_texto("Presione la telca de SPCACIO para volver al menu" ,15, 420, 300)
-                    
-                    for event in pygame.event.get():
-                        if event.type == pygame.KEYDOWN:
-                            if event.key == pygame.K_SPACE:
-                                self.reset_game()
-                                self.game_state="menu"
-                        if event.type == pygame.QUIT:
-                            pygame.quit()
                     pygame.display.update()
-        
-                # Aquí puedes agregar más lógica para el estado "playing"
 
-            pygame.display.update()
-            self.clock.tick(60)
-
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit()
+            # Fuera de la partida no hay nada animado: se espera al siguiente evento
+            if self.game_state in ("menu", "puntaje", "game_over") and self.game_state == shown_state:
+                for event in self.scheduler.wait():
+                    if event.type == pygame.QUIT:
+                        running = False
+                    elif self.game_state == "menu":
+                        # comprueba si clickeo el Botón para iniciar a jugar
+                        if PLAY_BUTTON.handle_event(event):
+                            self.wait_for_bank()
+                            self.game_state="playing"
+                            self.select_random_question()
+                        elif PUNTAJE_BUTTON.handle_event(event):
+                            self.wait_for_bank()
+                            self.game_state = "puntaje"
+                        elif QUIT_BUTTON.handle_event(event):
+                            running = False
+                    elif self.game_state == "puntaje":
+                        if BACK_BUTTON.handle_event(event):
+                            self.game_state="menu"
+                        elif event.type == pygame.KEYDOWN and event.key in (pygame.K_LEFT, pygame.K_RIGHT):
+                            self.score_category += 1 if event.key == pygame.K_RIGHT else -1
+                            page_changed = True
+                    elif self.game_state == "game_over" and event.type == pygame.KEYDOWN:
+                        if event.key == pygame.K_SPACE:
+                            self.reset_game()
+                            self.game_state="menu"
 
+        if self.scores is not None:
+            # Termina de escribir las partidas encoladas y actualiza el indice
+            self.scores.close()
         pygame.quit()
 
             
@@ -380,13 +512,21 @@ class Game:
 
 def main():
     
-    # Verificar que existe el archivo de preguntas
-    if not os.path.exists('questions.JSON'):
-        print("No se encuentra el archivo 'questions.json'. Por favor, crealo con el formato correcto.")
+    # Verificar que existe el archivo de preguntas (QUIZ_QUESTIONS elige otro banco)
+    questions_path = os.environ.get("QUIZ_QUESTIONS", 'questions.JSON')
+    if not os.path.exists(questions_path):
+        print(f"No se encuentra el archivo '{questions_path}'. Por favor, crealo con el formato correcto.")
         return
     
-    # Iniciar el juego
-    game = Game()
+    # Iniciar el juego (QUIZ_FPS=15 dibuja menos cuadros en equipos lentos)
+    render_fps = int(os.environ.get("QUIZ_FPS", FPS))
+    record = os.environ.get("QUIZ_RECORD")
+    if record:
+        # Graba la entrada para repetir la sesion con: python replay.py play <archivo>
+        from replay import record_session
+        record_session(record, questions_path, render_fps=render_fps)
+        return
+    game = Game(questions_path, render_fps=render_fps)
     game.run()
 
 if __name__ == "__main__":
@@ -0,0 +1,146 @@
+import os
+
+# El driver dummy de SDL tiene que elegirse antes de que gui.py inicie el video (pygame.display.init())
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+import random
+from typing import Callable, List, Optional, Tuple
+
+from inputs import MeasuredInput
+
+# Un guion recibe el numero de cuadro y el juego, y devuelve los eventos de ese cuadro
+Script = Callable[[int, "Game"], List[pygame.event.Event]]
+
+
+class ScriptedInput(MeasuredInput):
+    """Entrada guionizada para correr Game sin ventana y sin esperar.
+
+    Nunca bloquea ni limita los cuadros por segundo, asi que el juego corre
+    tan rapido como puede; cada cuadro cuenta como 1/fps segundos de juego.
+    Al llegar a max_frames cuadros o a max_questions preguntas mostradas
+    agrega un evento QUIT para terminar run().
+    """
+
+    def __init__(self, script: Script, max_frames: Optional[int] = None, max_questions: Optional[int] = None):
+        super().__init__()
+        self.script = script
+        self.max_frames = max_frames
+        self.max_questions = max_questions
+        self.game = None
+
+        self.frame = 0
+        self.questions_seen = 0
+        self.last_question = None
+        self.position: Tuple[int, int] = (0, 0)
+        self.buttons = [False, False, False]
+        # Tiempo de juego simulado, en milisegundos
+        self.virtual_ms = 0.0
+
+    def done(self) -> bool:
+        if self.max_frames is not None and self.frame >= self.max_frames:
+            return True
+        return self.max_questions is not None and self.questions_seen >= self.max_questions
+
+    def events(self) -> List[pygame.event.Event]:
+        self.pump()
+        self.frame += 1
+
+        game = self.game
+        if game.current_question is not None and game.current_question is not self.last_question:
+            self.last_question = game.current_question
+            self.questions_seen += 1
+
+        events = list(self.script(self.frame, game))
+        for event in events:
+            if event.type in (pygame.MOUSEMOTION, pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP):
+                self.position = event.pos
+            if event.type == pygame.MOUSEBUTTONDOWN:
+                self.buttons[event.button - 1] = True
+            elif event.type == pygame.MOUSEBUTTONUP:
+                self.buttons[event.button - 1] = False
+
+        if self.done():
+            events.append(pygame.event.Event(pygame.QUIT))
+        return events
+
+    def mouse_pos(self) -> Tuple[int, int]:
+        return self.position
+
+    def mouse_pressed(self) -> Tuple[bool, bool, bool]:
+        return tuple(self.buttons)
+
+    def frame_ms(self, fps: int) -> int:
+        # El juego ve un tiempo simulado de 1/fps por cuadro, asi la partida
+        # es la misma sin importar lo rapido que corra la maquina
+        before = int(self.virtual_ms)
+        self.virtual_ms += 1000 / fps
+        return int(self.virtual_ms) - before
+
+
+def click(pos: Tuple[int, int]) -> List[pygame.event.Event]:
+    return [
+        pygame.event.Event(pygame.MOUSEMOTION, pos=pos, rel=(0, 0), buttons=(0, 0, 0)),
+        pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=pos, button=1),
+    ]
+
+
+def key(key_code: int) -> List[pygame.event.Event]:
+    return [pygame.event.Event(pygame.KEYDOWN, key=key_code, mod=0, unicode="")]
+
+
+class QuizBot:
+    """Dos jugadores simulados: tocan el buzzer y responden cada pregunta"""
+
+    def __init__(self, seed: int = 0, accuracy: float = 0.5, reaction_frames: int = 10):
+        self.rng = random.Random(seed)
+        self.accuracy = accuracy
+        self.reaction_frames = reaction_frames
+        self.next_action = 0
+        self.pressed_at: Optional[Tuple[int, int]] = None
+
+    def click(self, pos: Tuple[int, int]) -> List[pygame.event.Event]:
+        self.pressed_at = pos
+        return click(pos)
+
+    def __call__(self, frame: int, game) -> List[pygame.event.Event]:
+        # Cada click se suelta en el cuadro siguiente
+        if self.pressed_at is not None:
+            pos, self.pressed_at = self.pressed_at, None
+            return [pygame.event.Event(pygame.MOUSEBUTTONUP, pos=pos, button=1)]
+        if frame < self.next_action:
+            return []
+        self.next_action = frame + self.reaction_frames
+
+        if game.game_state == "menu":
+            return self.click((400, 250))
+        if game.game_state == "puntaje":
+            return self.click((150, 500))
+        if game.game_state == "game_over":
+            return key(pygame.K_SPACE)
+        if game.current_player is None:
+            return key(self.rng.choice((pygame.K_q, pygame.K_RIGHTBRACKET)))
+        if not game.buttons:
+            return []
+
+        correct = [b for b in game.buttons if b.text == game.current_question.correct_answer]
+        if correct and self.rng.random() < self.accuracy:
+            button = correct[0]
+        else:
+            button = self.rng.choice(game.buttons)
+        return self.click(button.rect.center)
+
+
+def run_headless(script: Script, questions_path: str = 'questions.JSON',
+                 max_frames: Optional[int] = None, max_questions: Optional[int] = None,
+                 scores_path: Optional[str] = None):
+    """Corre el juego sin ventana hasta max_frames cuadros o max_questions preguntas"""
+    from gui import Game
+
+    # Por defecto las partidas simuladas no se guardan en la tabla de puntajes
+    source = ScriptedInput(script, max_frames, max_questions)
+    game = Game(questions_path, source, scores_path=scores_path)
+    source.game = game
+    game.run()
+    return game, source
@@ -0,0 +1,68 @@
+import pygame
+import time
+from typing import List, Optional, Tuple
+
+
+class PygameInput:
+    """Entrada del juego: eventos, estado del raton y ritmo de cuadros.
+
+    Game solo lee la entrada a traves de este objeto, asi se puede
+    reemplazar por una fuente guionizada (headless.py) sin tocar el loop.
+    """
+
+    def events(self) -> List[pygame.event.Event]:
+        return pygame.event.get()
+
+    def wait(self, timeout_ms: int) -> List[pygame.event.Event]:
+        """Bloquea hasta que llegue un evento o pase timeout_ms"""
+        event = pygame.event.wait(timeout_ms)
+        if event.type == pygame.NOEVENT:
+            return []
+        return [event] + pygame.event.get()
+
+    def mouse_pos(self) -> Tuple[int, int]:
+        return pygame.mouse.get_pos()
+
+    def mouse_pressed(self) -> Tuple[bool, bool, bool]:
+        return pygame.mouse.get_pressed()
+
+    def tick(self, clock: pygame.time.Clock, fps: int) -> int:
+        return clock.tick(fps)
+
+
+class MeasuredInput(PygameInput):
+    """Base de las entradas sin ventana (headless.py, replay.py).
+
+    No espera ni limita los cuadros por segundo; mide cuanto tarda en
+    realidad cada cuadro (de un tick() o wait() al siguiente), asi la
+    prueba de rendimiento y la repeticion de partidas miden igual. Las
+    subclases deciden cuantos milisegundos de juego dura cada cuadro.
+    """
+
+    def __init__(self):
+        # Duracion real de cada cuadro en segundos
+        self.frame_times: List[float] = []
+        self.last_frame: Optional[float] = None
+
+    def mark_frame(self):
+        now = time.perf_counter()
+        if self.last_frame is not None:
+            self.frame_times.append(now - self.last_frame)
+        self.last_frame = now
+
+    def pump(self):
+        # Vaciamos la cola real para que SDL no acumule eventos internos
+        pygame.event.pump()
+
+    def wait(self, timeout_ms: int) -> List[pygame.event.Event]:
+        self.mark_frame()
+        return self.events()
+
+    def tick(self, clock: pygame.time.Clock, fps: int) -> int:
+        self.mark_frame()
+        clock.tick()
+        return self.frame_ms(fps)
+
+    def frame_ms(self, fps: int) -> int:
+        """Milisegundos de juego que dura el cuadro que termina"""
+        raise NotImplementedError
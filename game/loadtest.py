@@ -0,0 +1,140 @@
+"""Prueba de carga del servidor de partidas (server.py).
+
+    python loadtest.py                           # 64 clientes durante 10 s
+    python loadtest.py --clients 256 --workers 4 --duration 30 --json carga.json
+
+Levanta el servidor en un puerto libre y abre --clients conexiones que juegan
+partidas completas (buzzer y respuesta al azar) hasta que pasa --duration.
+Informa partidas por segundo y la latencia de cada pedido (p50/p90/p99).
+"""
+import os
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import argparse
+import asyncio
+import json
+import random
+import subprocess
+import sys
+import time
+from typing import Dict, List, Optional, Tuple
+
+from benchmark import percentile
+
+
+class Client:
+    """Una conexion que juega partidas una tras otra"""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+                 rng: random.Random):
+        self.reader = reader
+        self.writer = writer
+        self.rng = rng
+        self.latencies: List[float] = []
+        self.sessions = 0
+        self.requests = 0
+
+    async def request(self, message: Dict) -> Dict:
+        start = time.perf_counter()
+        self.writer.write(json.dumps(message).encode("utf-8") + b"\n")
+        await self.writer.drain()
+        line = await self.reader.readline()
+        self.latencies.append((time.perf_counter() - start) * 1000)
+        self.requests += 1
+        if not line:
+            raise ConnectionError("El servidor cerro la conexion")
+        response = json.loads(line)
+        if not response.get("ok"):
+            raise RuntimeError(response.get("error"))
+        return response
+
+    async def play(self):
+        state = await self.request({"op": "new", "seed": self.rng.randrange(2 ** 32)})
+        session = state["session"]
+        while state["state"] == "playing":
+            player = self.rng.choice((1, 2))
+            state = await self.request({"op": "buzz", "session": session, "player": player})
+            if state["player"] is None:
+                continue
+            options = state["options"]
+            # El cliente no conoce la respuesta correcta: elige una opcion al azar
+            answer = self.rng.choice(options) if options else ""
+            state = await self.request({"op": "answer", "session": session, "answer": answer})
+        await self.request({"op": "close", "session": session})
+        self.sessions += 1
+
+
+async def run_clients(port: int, clients: int, duration: float, seed: int) -> Dict[str, float]:
+    async def worker(number: int) -> Client:
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        client = Client(reader, writer, random.Random(seed + number))
+        while time.perf_counter() < deadline:
+            await client.play()
+        writer.close()
+        return client
+
+    start = time.perf_counter()
+    deadline = start + duration
+    done = await asyncio.gather(*(worker(i) for i in range(clients)))
+    elapsed = time.perf_counter() - start
+
+    latencies = [ms for client in done for ms in client.latencies]
+    sessions = sum(client.sessions for client in done)
+    requests = sum(client.requests for client in done)
+    return {
+        "clients": clients,
+        "sessions": sessions,
+        "requests": requests,
+        "seconds": elapsed,
+        "sessions_per_s": sessions / elapsed if elapsed else 0.0,
+        "requests_per_s": requests / elapsed if elapsed else 0.0,
+        "latency_p50_ms": percentile(latencies, 50),
+        "latency_p90_ms": percentile(latencies, 90),
+        "latency_p99_ms": percentile(latencies, 99),
+        "latency_max_ms": max(latencies) if latencies else 0.0,
+    }
+
+
+def start_server(workers: int, questions: str) -> Tuple[subprocess.Popen, int]:
+    """Levanta server.py en un puerto libre y devuelve el proceso y el puerto"""
+    command = [sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)), "server.py"),
+               "--port", "0", "--workers", str(workers), "--questions", questions]
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, text=True)
+    line = process.stdout.readline()
+    if not line.startswith("Servidor en"):
+        process.kill()
+        raise RuntimeError(f"El servidor no arranco: {line.strip()}")
+    port = int(line.split()[2].rsplit(":", 1)[1])
+    return process, port
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=64)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--questions", default="questions.JSON")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="guarda los resultados en este archivo")
+    args = parser.parse_args(argv)
+
+    process, port = start_server(args.workers, args.questions)
+    try:
+        result = asyncio.run(run_clients(port, args.clients, args.duration, args.seed))
+    finally:
+        process.terminate()
+        process.wait()
+    result["workers"] = args.workers
+
+    print(f"{result['sessions']} partidas en {result['seconds']:.1f} s "
+          f"({result['sessions_per_s']:.0f} partidas/s, {result['requests_per_s']:.0f} pedidos/s)")
+    print(f"latencia p50 {result['latency_p50_ms']:.2f} ms  p90 {result['latency_p90_ms']:.2f} ms  "
+          f"p99 {result['latency_p99_ms']:.2f} ms  max {result['latency_max_ms']:.2f} ms")
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as file:
+            json.dump(result, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+import pygame
+from typing import Callable, Dict, Hashable, List, Tuple
+
+
+class SurfacePool:
+    """Superficies compuestas una sola vez y reutilizadas por clave.
+
+    get() solo llama a build() la primera vez que se pide una clave; despues
+    devuelve siempre la misma Surface, asi los cuadros que muestran el mismo
+    overlay no reservan memoria nueva.
+    """
+
+    def __init__(self):
+        self.surfaces: Dict[Hashable, pygame.Surface] = {}
+        self.created = 0
+
+    def get(self, key: Hashable, build: Callable[[], pygame.Surface]) -> pygame.Surface:
+        surface = self.surfaces.get(key)
+        if surface is None:
+            surface = build()
+            self.surfaces[key] = surface
+            self.created += 1
+        return surface
+
+    def clear(self):
+        self.surfaces.clear()
+
+
+def compose_overlay(size: Tuple[int, int], veil_color, alpha: int,
+                    texts: List[Tuple[pygame.Surface, Tuple[int, int]]]) -> pygame.Surface:
+    """Velo semitransparente con textos centrados, en el formato de la pantalla"""
+    surface = pygame.Surface(size, pygame.SRCALPHA)
+    surface.fill((*veil_color, alpha))
+    for text, center in texts:
+        surface.blit(text, text.get_rect(center=center))
+    if pygame.display.get_surface() is not None:
+        surface = surface.convert_alpha()
+    return surface
@@ -0,0 +1,168 @@
+import pygame
+import csv
+import json
+import os
+import sys
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional
+
+from assets import question_images
+from fonts import font_cache, get_font, render_text
+from text_layout import text_layout
+
+PHASES = ("events", "update", "background", "text", "image", "buttons", "flip")
+
+# Contadores de los puntos calientes conocidos: (nombre, funcion que da el total acumulado)
+COUNTERS: List[tuple] = [
+    ("font_loads", lambda: font_cache.font_misses),
+    ("text_renders", lambda: font_cache.text_misses),
+    ("text_layouts", lambda: text_layout.misses),
+    ("image_loads", lambda: question_images.misses + question_images.prefetched),
+]
+
+
+class Phase:
+    """Context manager de una fase; no hace nada si el perfilador esta apagado"""
+
+    def __init__(self, profiler: "FrameProfiler", name: str):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        if self.profiler.enabled:
+            self.profiler.enter(self.name)
+
+    def __exit__(self, *exc):
+        if self.profiler.enabled:
+            self.profiler.exit()
+
+
+class FrameProfiler:
+    """Tiempo y asignaciones por fase de cada cuadro, en un buffer circular.
+
+    Las fases se pueden anidar; el tiempo de una fase interna no se suma a la
+    externa, asi cada cuadro se reparte sin contar nada dos veces. Las
+    asignaciones se miden con sys.getallocatedblocks() (bloques netos).
+    """
+
+    def __init__(self, enabled: bool = False, capacity: int = 600,
+                 export_path: Optional[str] = None, export_every: int = 300):
+        self.enabled = enabled
+        self.show_overlay = False
+        self.frames: Deque[Dict[str, float]] = deque(maxlen=capacity)
+        self.export_path = export_path
+        self.export_every = export_every
+        self.frame_count = 0
+
+        self.phases = {name: Phase(self, name) for name in PHASES}
+        self.stack: List[str] = []
+        self.started = 0.0
+        self.blocks = 0
+        self.times: Dict[str, float] = {}
+        self.allocs: Dict[str, int] = {}
+        self.last_counters = {name: read() for name, read in COUNTERS}
+
+        # Texto del overlay; se recalcula cada overlay_every cuadros
+        self.overlay_every = 15
+        self.overlay_lines: List[str] = []
+        self.overlay_version = 0
+
+    def phase(self, name: str) -> Phase:
+        return self.phases[name]
+
+    def enter(self, name: str):
+        now = time.perf_counter()
+        blocks = sys.getallocatedblocks()
+        if self.stack:
+            self.charge(self.stack[-1], now, blocks)
+        self.stack.append(name)
+        self.started, self.blocks = now, blocks
+
+    def exit(self):
+        if not self.stack:
+            # Se encendio en medio de una fase
+            return
+        now = time.perf_counter()
+        blocks = sys.getallocatedblocks()
+        self.charge(self.stack.pop(), now, blocks)
+        self.started, self.blocks = now, blocks
+
+    def charge(self, name: str, now: float, blocks: int):
+        self.times[name] = self.times.get(name, 0.0) + (now - self.started)
+        self.allocs[name] = self.allocs.get(name, 0) + (blocks - self.blocks)
+
+    def toggle_overlay(self):
+        self.show_overlay = not self.show_overlay
+        # Mostrar el overlay implica empezar a medir
+        self.enabled = self.enabled or self.show_overlay
+
+    def end_frame(self):
+        """Cierra el cuadro actual y lo guarda en el buffer"""
+        if not self.enabled:
+            return
+        self.frame_count += 1
+        record: Dict[str, float] = {"frame": self.frame_count}
+        for name in PHASES:
+            record[name + "_ms"] = self.times.get(name, 0.0) * 1000
+        for name in PHASES:
+            record[name + "_allocs"] = self.allocs.get(name, 0)
+        for name, read in COUNTERS:
+            total = read()
+            record[name] = total - self.last_counters[name]
+            self.last_counters[name] = total
+        self.frames.append(record)
+        self.times.clear()
+        self.allocs.clear()
+
+        if self.show_overlay and self.frame_count % self.overlay_every == 0:
+            self.update_overlay()
+        if self.export_path and self.frame_count % self.export_every == 0:
+            self.export(self.export_path)
+
+    def summary(self) -> Dict[str, float]:
+        """Promedio de cada columna sobre los cuadros del buffer"""
+        if not self.frames:
+            return {}
+        keys = [k for k in self.frames[0] if k != "frame"]
+        return {k: sum(f[k] for f in self.frames) / len(self.frames) for k in keys}
+
+    def export(self, path: str):
+        """Guarda el buffer en CSV o JSON segun la extension"""
+        frames = list(self.frames)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8', newline='') as file:
+            if path.lower().endswith(".json"):
+                json.dump(frames, file)
+            elif frames:
+                writer = csv.DictWriter(file, fieldnames=list(frames[0]))
+                writer.writeheader()
+                writer.writerows(frames)
+        os.replace(tmp_path, path)
+
+    def update_overlay(self):
+        recent = list(self.frames)[-self.overlay_every:]
+        lines = []
+        for name in PHASES:
+            ms = sum(f[name + "_ms"] for f in recent) / len(recent)
+            allocs = sum(f[name + "_allocs"] for f in recent) / len(recent)
+            lines.append(f"{name:<10}{ms:6.2f} ms {allocs:6.0f}")
+        for name, _ in COUNTERS:
+            lines.append(f"{name:<13}{sum(f[name] for f in recent):5}")
+        self.overlay_lines = lines
+        self.overlay_version += 1
+
+    def overlay_rect(self) -> pygame.Rect:
+        return pygame.Rect(0, 90, 230, 16 * (len(PHASES) + len(COUNTERS)) + 8)
+
+    def draw_overlay(self, screen: pygame.Surface):
+        rect = self.overlay_rect()
+        screen.fill((0, 0, 0), rect)
+        font = get_font(14, None)
+        for i, line in enumerate(self.overlay_lines):
+            screen.blit(render_text(font, line, (255, 255, 255)), (rect.x + 4, rect.y + 4 + 16 * i))
+
+
+# Perfilador del proceso; QUIZ_PROFILE=1 lo activa y QUIZ_PROFILE_EXPORT=archivo.csv|.json exporta
+profiler = FrameProfiler(enabled=os.environ.get("QUIZ_PROFILE") == "1" or bool(os.environ.get("QUIZ_PROFILE_EXPORT")),
+                         export_path=os.environ.get("QUIZ_PROFILE_EXPORT"))
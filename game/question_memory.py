@@ -0,0 +1,93 @@
+"""Memoria por pregunta de un banco sintetico, antes y despues de Question con __slots__.
+
+    python question_memory.py                    # banco de 100000 preguntas
+    python question_memory.py --size 500000
+
+Mide con tracemalloc lo que ocupan las preguntas ya construidas (el objeto,
+sus listas o tuplas y los str que no comparte con otras preguntas), sin
+contar el JSON de origen. "antes" reproduce la clase original: __dict__ por
+instancia, lista de opciones y cadenas repetidas en cada pregunta.
+"""
+import os
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import argparse
+import gc
+import json
+import tempfile
+import tracemalloc
+from typing import Callable, Dict, List
+
+from Question import Question
+from benchmark import make_bank
+from question_store import QuestionStore
+
+
+class LegacyQuestion:
+    """La clase Question tal como era antes (solo para comparar)"""
+
+    def __init__(self, question: str, image_path: str, options: List[str], correct_answer: str, category: str):
+        self.question = question
+        self.image_path = image_path
+        self.options = options
+        self.correct_answer = correct_answer
+        self.category = category
+
+
+def load_items(size: int) -> List[str]:
+    """Lineas JSON del banco sintetico; cada pregunta se decodifica por separado"""
+    with tempfile.TemporaryDirectory() as tmp:
+        bank = os.path.join(tmp, "bank.JSON")
+        make_bank(size, bank)
+        with open(bank, 'r', encoding='utf-8') as file:
+            items = json.load(file)["questions"]
+    return [json.dumps(item, ensure_ascii=False) for item in items]
+
+
+def measure(build: Callable[[], object]) -> int:
+    """Bytes que siguen reservados despues de construir (y conservar) el resultado"""
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    used, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return used
+
+
+def build_with(cls, lines: List[str]) -> List[object]:
+    questions = []
+    for line in lines:
+        # Como al leer el banco: cada pregunta trae sus propias cadenas
+        item = json.loads(line)
+        questions.append(cls(item["question"], item["image_path"], item["options"],
+                             item["correct_answer"], item["category"]))
+    return questions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=100000)
+    args = parser.parse_args(argv)
+
+    lines = load_items(args.size)
+    results: Dict[str, int] = {
+        "antes (dict, lista)": measure(lambda: build_with(LegacyQuestion, lines)),
+        "despues (__slots__)": measure(lambda: build_with(Question, lines)),
+    }
+
+    # Con QuestionStore en memoria solo quedan los offsets y las categorias
+    with tempfile.TemporaryDirectory() as tmp:
+        bank = os.path.join(tmp, "bank.JSON")
+        make_bank(args.size, bank)
+        results["QuestionStore (indice)"] = measure(lambda: QuestionStore(bank))
+
+    print(f"{'representacion':<26}{'MB':>10}{'bytes/pregunta':>16}")
+    for name, used in results.items():
+        print(f"{name:<26}{used / (1024 * 1024):>10.1f}{used / args.size:>16.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,298 @@
+import hashlib
+import io
+import json
+import os
+import struct
+import tempfile
+from array import array
+from collections import OrderedDict
+from typing import BinaryIO, Dict, Iterator, List, Optional, TextIO, Tuple
+
+from Question import Question
+
+# Formato del indice: cabecera, nombres de categorias (JSON), offsets y categorias
+INDEX_MAGIC = b"PGQI"
+INDEX_VERSION = 1
+INDEX_HEADER = struct.Struct("<4sIQq40sII")
+CHUNK_SIZE = 64 * 1024
+FIELDS = ("question", "image_path", "options", "correct_answer", "category")
+# Donde van el indice y la copia JSON Lines si la carpeta del banco no se puede escribir
+CACHE_DIR = os.path.join(tempfile.gettempdir(), "quiz-cache")
+
+
+def cache_path(path: str) -> str:
+    """Ruta en CACHE_DIR para un archivo generado junto a path (unica por ruta absoluta)"""
+    tag = hashlib.sha1(os.path.abspath(path).encode("utf-8")).hexdigest()[:12]
+    return os.path.join(CACHE_DIR, f"{tag}-{os.path.basename(path)}")
+
+
+def file_hash(path: str) -> str:
+    """SHA-1 del contenido de un archivo, leido por bloques"""
+    digest = hashlib.sha1()
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def iter_json_questions(file: TextIO) -> Iterator[dict]:
+    """Recorre la lista "questions" de un JSON sin cargar el archivo entero"""
+    decoder = json.JSONDecoder()
+    buffer = ""
+    eof = False
+
+    def fill() -> bool:
+        nonlocal buffer, eof
+        chunk = file.read(CHUNK_SIZE)
+        if not chunk:
+            eof = True
+            return False
+        buffer += chunk
+        return True
+
+    # Avanza hasta el '[' que abre la lista de preguntas
+    while True:
+        key = buffer.find('"questions"')
+        start = buffer.find('[', key) if key >= 0 else -1
+        if start >= 0:
+            pos = start + 1
+            break
+        if not fill():
+            raise ValueError("No se encontro la lista 'questions'")
+
+    while True:
+        while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+            pos += 1
+        if pos >= len(buffer):
+            buffer, pos = "", 0
+            if not fill():
+                raise ValueError("La lista 'questions' no esta cerrada")
+            continue
+        if buffer[pos] == ']':
+            return
+        try:
+            item, end = decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            # El objeto esta partido entre dos bloques: se lee mas y se reintenta
+            buffer, pos = buffer[pos:], 0
+            if eof or not fill():
+                raise
+            continue
+        yield item
+        pos = end
+        # Descartamos lo ya leido para que el buffer no crezca
+        if pos > CHUNK_SIZE:
+            buffer, pos = buffer[pos:], 0
+
+
+def validate_question(item: dict, image_exists: Dict[str, bool]) -> Optional[str]:
+    """Devuelve el motivo por el que la pregunta no es valida, o None"""
+    if not isinstance(item, dict):
+        return "no es un objeto"
+    for field in FIELDS:
+        if field not in item:
+            return f"falta '{field}'"
+    if not isinstance(item["options"], list) or not item["options"]:
+        return "'options' debe ser una lista no vacia"
+    if item["correct_answer"] not in item["options"]:
+        return "'correct_answer' no esta entre las opciones"
+    path = item["image_path"]
+    if path not in image_exists:
+        image_exists[path] = os.path.exists(path)
+    if not image_exists[path]:
+        return f"no existe la imagen '{path}'"
+    return None
+
+
+class QuestionStore:
+    """Banco de preguntas indexado; cada Question se crea solo al pedirla.
+
+    Acepta el questions.JSON de siempre o un archivo JSON Lines (una pregunta
+    por linea). En la primera carga se valida todo en una sola pasada y se
+    genera un indice con el offset y la categoria de cada pregunta valida;
+    las siguientes cargas solo leen ese indice. Un questions.JSON se copia
+    ademas a JSON Lines para poder leer cada pregunta con un seek.
+
+    Si la carpeta del banco no se puede escribir (una instalacion de solo
+    lectura) esos archivos van a CACHE_DIR; si tampoco se puede ahi, el
+    indice queda solo en memoria y la copia JSON Lines en un buffer.
+    """
+
+    def __init__(self, source: str, cache_size: int = 64):
+        self.source = source
+        self.offsets = array("Q")
+        self.category_ids = array("H")
+        self.category_names: List[str] = []
+        self.cache: "OrderedDict[int, Question]" = OrderedDict()
+        self.cache_size = cache_size
+
+        for self.data_path, self.index_path in self.locations():
+            if self.load_index():
+                self.data = open(self.data_path, 'rb')
+                break
+        else:
+            self.data = self.build_index()
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def __getitem__(self, index: int) -> Question:
+        question = self.cache.get(index)
+        if question is not None:
+            self.cache.move_to_end(index)
+            return question
+
+        self.data.seek(self.offsets[index])
+        item = json.loads(self.data.readline())
+        question = Question(
+            item['question'],
+            item['image_path'],
+            item['options'],
+            item['correct_answer'],
+            self.category_names[self.category_ids[index]]
+        )
+        self.cache[index] = question
+        if len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+        return question
+
+    def category(self, index: int) -> str:
+        return self.category_names[self.category_ids[index]]
+
+    def iter_categories(self) -> Iterator[str]:
+        names = self.category_names
+        for category_id in self.category_ids:
+            yield names[category_id]
+
+    def locations(self) -> List[Tuple[str, str]]:
+        """(datos JSON Lines, indice): junto al banco y, como alternativa, en CACHE_DIR"""
+        index_path = self.source + ".idx"
+        if self.source.lower().endswith(".jsonl"):
+            return [(self.source, index_path), (self.source, cache_path(index_path))]
+        data_path = self.source + ".jsonl"
+        return [(data_path, index_path), (cache_path(data_path), cache_path(index_path))]
+
+    def open_output(self, path: str) -> BinaryIO:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        return open(path, 'wb')
+
+    def source_identity(self):
+        stat = os.stat(self.source)
+        return stat.st_size, stat.st_mtime_ns
+
+    def load_index(self) -> bool:
+        """Carga el indice si existe y corresponde al archivo de origen"""
+        try:
+            with open(self.index_path, 'rb') as file:
+                header = file.read(INDEX_HEADER.size)
+                magic, version, size, mtime, digest, count, names_size = INDEX_HEADER.unpack(header)
+                if magic != INDEX_MAGIC or version != INDEX_VERSION:
+                    return False
+                if (size, mtime) != self.source_identity():
+                    # Si solo cambio la fecha, el hash decide
+                    if digest.decode("ascii") != file_hash(self.source):
+                        return False
+                if not os.path.exists(self.data_path):
+                    return False
+                self.category_names = json.loads(file.read(names_size))
+                self.offsets = array("Q")
+                self.offsets.fromfile(file, count)
+                self.category_ids = array("H")
+                self.category_ids.fromfile(file, count)
+        except (OSError, EOFError, ValueError, struct.error):
+            return False
+        return True
+
+    def build_index(self) -> BinaryIO:
+        """Valida las preguntas en una sola pasada, escribe el indice y devuelve los datos abiertos"""
+        categories: Dict[str, int] = {}
+        image_exists: Dict[str, bool] = {}
+        self.offsets = array("Q")
+        self.category_ids = array("H")
+        skipped = 0
+
+        def add(number: int, item, offset: int) -> bool:
+            nonlocal skipped
+            error = validate_question(item, image_exists)
+            if error:
+                skipped += 1
+                print(f"Pregunta {number} ignorada: {error}")
+                return False
+            category = item["category"]
+            if category not in categories:
+                categories[category] = len(categories)
+            self.offsets.append(offset)
+            self.category_ids.append(categories[category])
+            return True
+
+        data = None
+        if self.data_path == self.source:
+            with open(self.source, 'rb') as file:
+                offset = 0
+                for number, line in enumerate(file, 1):
+                    if line.strip():
+                        try:
+                            item = json.loads(line)
+                        except ValueError:
+                            item = None
+                        add(number, item, offset)
+                    offset += len(line)
+        else:
+            out = None
+            for self.data_path, self.index_path in self.locations():
+                try:
+                    out = self.open_output(self.data_path + ".tmp")
+                    break
+                except OSError as error:
+                    print(f"No se puede escribir {self.data_path}: {error}")
+            if out is None:
+                # Ninguna carpeta se puede escribir: la copia queda en memoria
+                out = io.BytesIO()
+            with open(self.source, 'r', encoding='utf-8') as file:
+                for number, item in enumerate(iter_json_questions(file), 1):
+                    offset = out.tell()
+                    if add(number, item, offset):
+                        line = {field: item[field] for field in FIELDS}
+                        out.write(json.dumps(line, ensure_ascii=False).encode("utf-8") + b"\n")
+            if isinstance(out, io.BytesIO):
+                out.seek(0)
+                data = out
+            else:
+                out.close()
+                os.replace(out.name, self.data_path)
+
+        if skipped:
+            print(f"{skipped} preguntas ignoradas en {self.source}")
+
+        self.category_names = list(categories)
+        if data is None:
+            self.write_index()
+            data = open(self.data_path, 'rb')
+        return data
+
+    def write_index(self):
+        """Escribe el indice junto al banco o, si no se puede, en CACHE_DIR"""
+        names = json.dumps(self.category_names, ensure_ascii=False).encode("utf-8")
+        size, mtime = self.source_identity()
+        digest = file_hash(self.source).encode("ascii")
+        for data_path, index_path in self.locations():
+            if data_path != self.data_path:
+                continue
+            tmp_path = index_path + ".tmp"
+            try:
+                with self.open_output(tmp_path) as file:
+                    file.write(INDEX_HEADER.pack(INDEX_MAGIC, INDEX_VERSION, size, mtime, digest,
+                                                 len(self.offsets), len(names)))
+                    file.write(names)
+                    self.offsets.tofile(file)
+                    self.category_ids.tofile(file)
+                os.replace(tmp_path, index_path)
+            except OSError as error:
+                print(f"No se puede escribir {index_path}: {error}")
+                continue
+            self.index_path = index_path
+            return
+        # Sin indice en disco: la proxima carga vuelve a validar el banco
+
+    def close(self):
+        self.data.close()
@@ -0,0 +1,79 @@
+import pygame
+from typing import Callable, Dict, Hashable, List, Tuple
+
+
+class DirtyRenderer:
+    """Dibujado por rectangulos sucios.
+
+    La capa estatica (fondo, barra superior, puntuaciones, pregunta e imagen)
+    se pinta una vez en una Surface aparte y se conserva mientras su clave no
+    cambie. Los elementos dinamicos se registran cada cuadro con add() junto
+    con una clave que describe su estado; end_frame() compara con el cuadro
+    anterior, restaura el fondo solo en las zonas que cambiaron, vuelve a
+    dibujar los elementos que las tocan y actualiza solo esos rectangulos.
+    """
+
+    def __init__(self, screen: pygame.Surface):
+        self.screen = screen
+        self.static = pygame.Surface(screen.get_size()).convert(screen)
+        self.static_key: Hashable = None
+        self.previous: Dict[str, Tuple[Hashable, pygame.Rect]] = {}
+        self.elements: List[Tuple[str, Hashable, pygame.Rect, Callable[[], None]]] = []
+        self.full_redraw = True
+
+    def invalidate(self):
+        """Fuerza a redibujar toda la pantalla en el siguiente cuadro"""
+        self.full_redraw = True
+
+    def set_static(self, key: Hashable, paint: Callable[[pygame.Surface], None]):
+        """Repinta la capa estatica solo si su clave cambio"""
+        if self.static_key is None or key != self.static_key:
+            paint(self.static)
+            self.static_key = key
+            self.full_redraw = True
+
+    def add(self, name: str, key: Hashable, rect: pygame.Rect, draw: Callable[[], None]):
+        """Registra un elemento dinamico para este cuadro (en orden de dibujo)"""
+        self.elements.append((name, key, pygame.Rect(rect), draw))
+
+    def end_frame(self) -> List[pygame.Rect]:
+        """Dibuja lo que cambio y actualiza la pantalla; devuelve las zonas actualizadas"""
+        elements, self.elements = self.elements, []
+        current = {name: (key, rect) for name, key, rect, _ in elements}
+
+        if self.full_redraw:
+            self.full_redraw = False
+            self.previous = current
+            self.screen.blit(self.static, (0, 0))
+            for _, _, _, draw in elements:
+                draw()
+            pygame.display.flip()
+            return [self.screen.get_rect()]
+
+        dirty: List[pygame.Rect] = []
+        for name, (key, rect) in current.items():
+            old = self.previous.get(name)
+            if old is None:
+                dirty.append(rect)
+            elif old[0] != key or old[1] != rect:
+                dirty.append(old[1].union(rect))
+        for name, (_, rect) in self.previous.items():
+            if name not in current:
+                dirty.append(rect)
+        self.previous = current
+
+        dirty = [r for r in dirty if r.width > 0 and r.height > 0]
+        if not dirty:
+            return []
+
+        # Cada zona se restaura desde la capa estatica y se redibuja recortada,
+        # asi los elementos semitransparentes no se acumulan sobre si mismos
+        for area in dirty:
+            self.screen.set_clip(area)
+            self.screen.blit(self.static, area, area)
+            for _, _, rect, draw in elements:
+                if rect.colliderect(area):
+                    draw()
+        self.screen.set_clip(None)
+        pygame.display.update(dirty)
+        return dirty
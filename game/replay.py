@@ -0,0 +1,340 @@
+"""Grabacion y repeticion determinista de partidas.
+
+    python replay.py record sesion.qrec          # juega con ventana y graba la entrada
+    python replay.py play sesion.qrec            # la repite sin ventana y mide los cuadros
+    QUIZ_RECORD=sesion.qrec python gui.py        # lo mismo que "record"
+
+La grabacion guarda la semilla del selector de preguntas, cada lista de
+eventos que leyo el juego, las posiciones del raton y la duracion de cada
+cuadro. Al repetirla el juego recibe exactamente la misma entrada, sin
+esperar, asi que corre mas rapido que en tiempo real; al final se comprueba
+que el resultado de cada partida terminada (puntajes, ganador, preguntas) y
+el orden de las preguntas sean los mismos que en la grabacion.
+"""
+import os
+import sys
+
+if __name__ == "__main__" and len(sys.argv) > 1 and sys.argv[1] == "play":
+    # El driver dummy de SDL tiene que elegirse antes de importar gui
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+import argparse
+import random
+import struct
+import time
+import zlib
+from typing import BinaryIO, Dict, List, Optional, Tuple
+
+from inputs import MeasuredInput, PygameInput
+from question_store import file_hash
+
+MAGIC = b"PGQR"
+VERSION = 2
+# magia, version, semilla, cuadros por segundo, SHA-1 del banco de preguntas
+HEADER = struct.Struct("<4sHQH40s")
+# Registros: etiqueta de un byte y sus datos
+EVENTS = struct.Struct("<cH")  # b"E" (events) o b"W" (wait), cantidad de eventos
+EVENT = struct.Struct("<BhhI")  # tipo, x, y, tecla o boton
+MOUSE = struct.Struct("<chh")  # b"M", posicion del raton cuando cambia
+PRESSED = struct.Struct("<cB")  # b"P", botones del raton (bits) cuando cambian
+TICK = struct.Struct("<cH")  # b"T", milisegundos del cuadro
+# b"S": partidas terminadas y CRC de sus resultados, puntajes y ganador (-1 si no hay)
+# de la ultima, preguntas mostradas y CRC de sus textos
+SUMMARY = struct.Struct("<cHIhhbII")
+# Resultado de una partida para el CRC: puntajes, ganador y preguntas hechas
+RESULT = struct.Struct("<hhbI")
+
+# Solo se graban los eventos que el juego usa
+KINDS = [pygame.QUIT, pygame.KEYDOWN, pygame.KEYUP, pygame.MOUSEMOTION,
+         pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP]
+
+
+def encode_event(event: pygame.event.Event) -> Optional[bytes]:
+    if event.type not in KINDS:
+        return None
+    x, y = getattr(event, "pos", (0, 0))
+    code = getattr(event, "key", getattr(event, "button", 0))
+    return EVENT.pack(KINDS.index(event.type), x, y, code)
+
+
+def decode_event(data: bytes, offset: int) -> pygame.event.Event:
+    kind, x, y, code = EVENT.unpack_from(data, offset)
+    event_type = KINDS[kind]
+    if event_type in (pygame.KEYDOWN, pygame.KEYUP):
+        return pygame.event.Event(event_type, key=code, mod=0, unicode="")
+    if event_type == pygame.MOUSEMOTION:
+        return pygame.event.Event(event_type, pos=(x, y), rel=(0, 0), buttons=(0, 0, 0))
+    if event_type in (pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP):
+        return pygame.event.Event(event_type, pos=(x, y), button=code)
+    return pygame.event.Event(event_type)
+
+
+class SessionDigest:
+    """Resumen de una sesion: el resultado de cada partida terminada y las
+    preguntas que se mostraron, en orden.
+
+    El resultado se toma al ver la pantalla de fin de partida: al salir el
+    juego ya puede haberse reiniciado (ESPACIO pone los puntajes en cero).
+    """
+
+    def __init__(self):
+        self.questions = 0
+        self.crc = 0
+        self.last_question = None
+        self.matches = 0
+        self.results_crc = 0
+        self.last_result = (0, 0, -1)
+        self.finished = False
+
+    def observe(self, game):
+        question = game.current_question
+        if question is not None and question is not self.last_question:
+            self.last_question = question
+            self.questions += 1
+            self.crc = zlib.crc32(question.question.encode("utf-8"), self.crc)
+        finished = game.game_state == "game_over"
+        if finished and not self.finished:
+            winner = game.winner if game.winner is not None else -1
+            self.last_result = (game.player1_score, game.player2_score, winner)
+            self.matches += 1
+            self.results_crc = zlib.crc32(RESULT.pack(*self.last_result, len(game.selected_questions)),
+                                          self.results_crc)
+        self.finished = finished
+
+    def summary(self) -> Tuple[int, int, int, int, int, int, int]:
+        return (self.matches, self.results_crc) + self.last_result + (self.questions, self.crc)
+
+
+class RecordingInput(PygameInput):
+    """Entrada real que ademas graba todo lo que lee el juego"""
+
+    def __init__(self, path: str, seed: int, fps: int, questions_path: str,
+                 inner: Optional[PygameInput] = None):
+        self.inner = inner or PygameInput()
+        self.file: BinaryIO = open(path, 'wb')
+        self.file.write(HEADER.pack(MAGIC, VERSION, seed, fps, file_hash(questions_path).encode("ascii")))
+        self.game = None
+        self.digest = SessionDigest()
+        self.position: Optional[Tuple[int, int]] = None
+        self.buttons: Optional[int] = None
+
+    def record_events(self, tag: bytes, events: List[pygame.event.Event]) -> List[pygame.event.Event]:
+        if self.game is not None:
+            self.digest.observe(self.game)
+        encoded = [data for data in map(encode_event, events) if data is not None]
+        self.file.write(EVENTS.pack(tag, len(encoded)))
+        self.file.write(b"".join(encoded))
+        return events
+
+    def events(self) -> List[pygame.event.Event]:
+        return self.record_events(b"E", self.inner.events())
+
+    def wait(self, timeout_ms: int) -> List[pygame.event.Event]:
+        return self.record_events(b"W", self.inner.wait(timeout_ms))
+
+    def mouse_pos(self) -> Tuple[int, int]:
+        position = self.inner.mouse_pos()
+        if position != self.position:
+            self.position = position
+            self.file.write(MOUSE.pack(b"M", *position))
+        return position
+
+    def mouse_pressed(self) -> Tuple[bool, bool, bool]:
+        pressed = self.inner.mouse_pressed()
+        bits = sum(1 << i for i, down in enumerate(pressed[:3]) if down)
+        if bits != self.buttons:
+            self.buttons = bits
+            self.file.write(PRESSED.pack(b"P", bits))
+        return pressed
+
+    def tick(self, clock: pygame.time.Clock, fps: int) -> int:
+        frame_ms = min(self.inner.tick(clock, fps), 65535)
+        self.file.write(TICK.pack(b"T", frame_ms))
+        return frame_ms
+
+    def close(self):
+        """Escribe el resumen final de la partida y cierra el archivo"""
+        if self.game is not None:
+            self.digest.observe(self.game)
+            self.file.write(SUMMARY.pack(b"S", *self.digest.summary()))
+        self.file.close()
+
+
+class ReplayInput(MeasuredInput):
+    """Entrada que repite una grabacion sin esperar ni leer la ventana"""
+
+    def __init__(self, path: str):
+        super().__init__()
+        with open(path, 'rb') as file:
+            self.data = file.read()
+        magic, version, self.seed, self.fps, digest = HEADER.unpack_from(self.data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} no es una grabacion valida")
+        self.questions_hash = digest.decode("ascii")
+        self.pos = HEADER.size
+        self.game = None
+        self.digest = SessionDigest()
+        self.position: Tuple[int, int] = (0, 0)
+        self.buttons = 0
+        self.game_ms = 0
+
+    def peek(self) -> bytes:
+        return self.data[self.pos:self.pos + 1]
+
+    def read(self, record: struct.Struct) -> tuple:
+        values = record.unpack_from(self.data, self.pos)
+        self.pos += record.size
+        return values
+
+    def expect(self, tag: bytes) -> bool:
+        """Consume los cambios de raton pendientes y comprueba el siguiente registro"""
+        while self.peek() in (b"M", b"P"):
+            self.read_mouse()
+        found = self.peek()
+        if found == b"S":
+            return False
+        if found and found != tag:
+            raise ValueError(f"La repeticion se desincronizo en el byte {self.pos}: "
+                             f"se esperaba {tag!r} y hay {found!r}")
+        return bool(found)
+
+    def read_summary(self) -> Optional[Tuple[int, int, int, int, int, int, int]]:
+        """Resumen final grabado, si el juego llego hasta el"""
+        while self.peek() in (b"M", b"P"):
+            self.read_mouse()
+        if self.peek() != b"S":
+            return None
+        return self.read(SUMMARY)[1:]
+
+    def read_mouse(self):
+        if self.peek() == b"M":
+            self.position = tuple(self.read(MOUSE)[1:])
+        else:
+            self.buttons = self.read(PRESSED)[1]
+
+    def read_events(self, tag: bytes) -> List[pygame.event.Event]:
+        self.pump()
+        if self.game is not None:
+            self.digest.observe(self.game)
+        if not self.expect(tag):
+            # Se acabo la grabacion: termina el juego
+            return [pygame.event.Event(pygame.QUIT)]
+        _, count = self.read(EVENTS)
+        events = [decode_event(self.data, self.pos + i * EVENT.size) for i in range(count)]
+        self.pos += count * EVENT.size
+        return events
+
+    def events(self) -> List[pygame.event.Event]:
+        return self.read_events(b"E")
+
+    def wait(self, timeout_ms: int) -> List[pygame.event.Event]:
+        self.mark_frame()
+        return self.read_events(b"W")
+
+    def mouse_pos(self) -> Tuple[int, int]:
+        if self.peek() == b"M":
+            self.read_mouse()
+        return self.position
+
+    def mouse_pressed(self) -> Tuple[bool, bool, bool]:
+        if self.peek() == b"P":
+            self.read_mouse()
+        return tuple(bool(self.buttons & (1 << i)) for i in range(3))
+
+    def frame_ms(self, fps: int) -> int:
+        if not self.expect(b"T"):
+            return 0
+        frame_ms = self.read(TICK)[1]
+        self.game_ms += frame_ms
+        return frame_ms
+
+
+def record_session(path: str, questions_path: str = 'questions.JSON', render_fps: int = 30):
+    """Juega una partida normal grabando la entrada en `path`"""
+    from gui import Game
+
+    seed = random.SystemRandom().randrange(2 ** 63)
+    source = RecordingInput(path, seed, render_fps, questions_path)
+    game = Game(questions_path, source, render_fps=render_fps, seed=seed)
+    source.game = game
+    try:
+        game.run()
+    finally:
+        source.close()
+    print(f"Sesion grabada en {path} ({os.path.getsize(path)} bytes)")
+
+
+def replay_session(path: str, questions_path: str = 'questions.JSON') -> Dict:
+    """Repite una grabacion sin ventana; devuelve los tiempos y si el resultado coincide"""
+    from benchmark import percentile
+    from gui import Game
+
+    source = ReplayInput(path)
+    if source.questions_hash != file_hash(questions_path):
+        print(f"Aviso: {questions_path} no es el banco con el que se grabo la sesion")
+    # Las partidas repetidas no se guardan en la tabla de puntajes
+    game = Game(questions_path, source, render_fps=source.fps, seed=source.seed, scores_path=None)
+    source.game = game
+    start = time.perf_counter()
+    game.run()
+    elapsed = time.perf_counter() - start
+
+    expected = source.read_summary()
+    source.digest.observe(game)
+    actual = source.digest.summary()
+    times = [t * 1000 for t in source.frame_times]
+    names = ("partidas terminadas", "resultados de las partidas", "puntaje 1 (ultima partida)", "puntaje 2",
+             "ganador", "preguntas", "orden de preguntas")
+    mismatches = []
+    if expected is None:
+        mismatches.append("la grabacion no tiene resumen final")
+    else:
+        mismatches += [f"{name}: grabado {want}, repetido {got}"
+                       for name, want, got in zip(names, expected, actual) if want != got]
+    return {
+        "frames": len(source.frame_times) + 1,
+        "seconds": elapsed,
+        "game_seconds": source.game_ms / 1000,
+        "frame_p50_ms": percentile(times, 50),
+        "frame_p90_ms": percentile(times, 90),
+        "frame_p99_ms": percentile(times, 99),
+        "frame_max_ms": max(times) if times else 0.0,
+        "mismatches": mismatches,
+    }
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("mode", choices=("record", "play"))
+    parser.add_argument("path")
+    parser.add_argument("--questions", default="questions.JSON")
+    parser.add_argument("--fps", type=int, default=30)
+    args = parser.parse_args(argv)
+
+    if args.mode == "record":
+        record_session(args.path, args.questions, args.fps)
+        return
+
+    try:
+        result = replay_session(args.path, args.questions)
+    except ValueError as error:
+        # La grabacion no es valida o el juego tomo otro camino que al grabarla
+        print(error)
+        sys.exit(1)
+    speedup = result["game_seconds"] / result["seconds"] if result["seconds"] else 0.0
+    print(f"{result['frames']} cuadros en {result['seconds']:.2f} s "
+          f"({result['game_seconds']:.1f} s de juego, x{speedup:.1f} tiempo real)")
+    print(f"cuadro p50 {result['frame_p50_ms']:.3f} ms  p90 {result['frame_p90_ms']:.3f} ms  "
+          f"p99 {result['frame_p99_ms']:.3f} ms  max {result['frame_max_ms']:.3f} ms")
+    if result["mismatches"]:
+        print("La repeticion NO coincide con la grabacion:")
+        for mismatch in result["mismatches"]:
+            print(f"  {mismatch}")
+        sys.exit(1)
+    print("La repeticion coincide con la grabacion")
+
+
+if __name__ == "__main__":
+    main()
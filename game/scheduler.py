@@ -0,0 +1,55 @@
+import pygame
+import time
+from typing import List, Optional
+
+from inputs import PygameInput
+
+
+def now_ms() -> int:
+    # pygame.time.get_ticks() devuelve 0 si no se llamo a pygame.init()
+    return int(time.monotonic() * 1000)
+
+
+class IdleScheduler:
+    """Espera eventos en lugar de sondear cuando nada se mueve en pantalla.
+
+    Se usa en el menu, la pantalla de puntajes y la de fin de juego: wait()
+    bloquea en pygame.event.wait (a traves de la fuente de entrada) hasta
+    que llega un evento o vence el plazo, y solo entonces needs_redraw()
+    indica que hay que volver a dibujar.
+    Durante la partida el loop vuelve a correr a ritmo fijo con clock.tick.
+    """
+
+    def __init__(self, source: PygameInput, timeout_ms: int = 1000):
+        self.source = source
+        self.timeout_ms = timeout_ms
+        self.redraw = True
+        self.deadline: Optional[int] = None
+
+    def request_redraw(self, delay_ms: int = 0):
+        """Pide un redibujado ahora o dentro de delay_ms milisegundos"""
+        if delay_ms <= 0:
+            self.redraw = True
+            return
+        deadline = now_ms() + delay_ms
+        if self.deadline is None or deadline < self.deadline:
+            self.deadline = deadline
+
+    def needs_redraw(self) -> bool:
+        redraw, self.redraw = self.redraw, False
+        return redraw
+
+    def wait(self) -> List[pygame.event.Event]:
+        """Bloquea hasta el siguiente evento o plazo y devuelve los eventos pendientes"""
+        timeout = self.timeout_ms
+        if self.deadline is not None:
+            timeout = min(timeout, self.deadline - now_ms())
+        # Con timeout 0 pygame esperaria para siempre
+        events = self.source.wait(max(1, timeout))
+
+        if self.deadline is not None and now_ms() >= self.deadline:
+            self.deadline = None
+            self.redraw = True
+        if events:
+            self.redraw = True
+        return events
@@ -0,0 +1,401 @@
+import bisect
+import json
+import os
+import queue
+import struct
+import threading
+import time
+import zlib
+from typing import BinaryIO, Dict, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+SCORES_PATH = "scores.log"
+# Mejores puntajes que se guardan por tabla (general y por categoria)
+KEEP = 100
+# Cada cuantos registros se reescribe el indice
+CHECKPOINT_EVERY = 1000
+OVERALL = ""
+
+# Windows bloquea rangos de bytes: se bloquea uno muy lejos del final para no impedir las lecturas
+LOCK_OFFSET = 2 ** 62
+
+# Cada registro del log: tamaño y CRC32 del contenido, y el contenido
+FRAME = struct.Struct("<II")
+# Bytes que se guardan del texto de una pregunta y del nombre de una categoria
+MAX_TEXT = 4096
+MAX_NAME = 255
+# Partida de un jugador: tipo, fecha, jugador, gano, puntaje, preguntas, categorias
+MATCH = struct.Struct("<cdBBhHB")
+MATCH_CATEGORY = struct.Struct("<hB")
+# Resultado de una pregunta: tipo, respondida, correcta, ms hasta el buzzer, largo del texto
+QUESTION = struct.Struct("<cBBHH")
+
+INDEX_MAGIC = b"PGQS"
+INDEX_VERSION = 2
+INDEX_HEADER = struct.Struct("<4sIQI")
+
+
+def lock_file(file: BinaryIO):
+    """Bloqueo exclusivo del archivo entre procesos (espera si otro lo tiene)"""
+    if fcntl is not None:
+        fcntl.flock(file.fileno(), fcntl.LOCK_EX)
+        return
+    position = file.tell()
+    file.seek(LOCK_OFFSET)
+    while True:
+        try:
+            msvcrt.locking(file.fileno(), msvcrt.LK_LOCK, 1)
+            break
+        except OSError:
+            pass  # LK_LOCK se rinde despues de 10 intentos
+    file.seek(position)
+
+
+def unlock_file(file: BinaryIO):
+    if fcntl is not None:
+        fcntl.flock(file.fileno(), fcntl.LOCK_UN)
+        return
+    position = file.tell()
+    file.seek(LOCK_OFFSET)
+    msvcrt.locking(file.fileno(), msvcrt.LK_UNLCK, 1)
+    file.seek(position)
+
+
+def clamp(value: int, low: int, high: int) -> int:
+    return max(low, min(int(value), high))
+
+
+def truncate_utf8(text: str, limit: int) -> bytes:
+    """Texto en UTF-8 de a lo sumo limit bytes, sin cortar un caracter a la mitad"""
+    return text.encode("utf-8")[:limit].decode("utf-8", "ignore").encode("utf-8")
+
+
+# (-puntaje, fecha, jugador): ordenado de mayor a menor puntaje y, a igual puntaje, el mas antiguo primero
+Entry = Tuple[int, float, int]
+
+
+class ScoreStore:
+    """Tabla de puntajes persistente: log de solo agregado mas un indice compacto.
+
+    Cada partida terminada y cada pregunta jugada se agregan al log con su
+    CRC; si el juego se corta a mitad de una escritura, la cola rota se
+    descarta al abrir. El indice guarda los mejores KEEP puntajes de cada
+    tabla y las estadisticas por pregunta junto con el offset del log que
+    cubre, asi al abrir solo se relee lo escrito despues.
+
+    Varios juegos pueden compartir el mismo log: cada agregado se hace con
+    el archivo bloqueado, despues de aplicar lo que otros procesos hayan
+    agregado desde la ultima vez, asi el offset del indice siempre cae en
+    el limite de un registro y cubre todo lo anterior.
+
+    Las escrituras las hace un hilo aparte: record_*() solo encola y vuelve
+    enseguida. El hilo aplica cada registro a las tablas en memoria despues
+    de escribirlo, por eso top() es solo un slice de una lista ya ordenada.
+    """
+
+    def __init__(self, path: str = SCORES_PATH):
+        self.path = path
+        self.index_path = path + ".idx"
+        self.lock = threading.Lock()
+        self.boards: Dict[str, List[Entry]] = {}
+        # texto de la pregunta -> [jugada, respondida, correcta, ms totales hasta el buzzer]
+        self.questions: Dict[str, List[int]] = {}
+        self.matches = 0
+        # Cambia cada vez que se aplica un registro (para redibujar la pantalla)
+        self.version = 0
+
+        self.requests: "queue.Queue[Optional[bytes]]" = queue.Queue()
+        self.worker: Optional[threading.Thread] = None
+        self.offset = 0
+        # Offset que cubria el indice al abrir: el log nunca se corta antes de el
+        self.indexed_offset = 0
+        self.unindexed = 0
+        self.load()
+
+    # Lectura
+
+    def top(self, k: int = 10, category: Optional[str] = None) -> List[Tuple[int, float, int]]:
+        """Los k mejores (puntaje, fecha, jugador), en general o de una categoria"""
+        with self.lock:
+            board = self.boards.get(category or OVERALL, [])
+            return [(-score, when, player) for score, when, player in board[:k]]
+
+    def categories(self) -> List[str]:
+        with self.lock:
+            return sorted(name for name in self.boards if name != OVERALL)
+
+    def question_stats(self, text: str) -> Optional[Dict[str, float]]:
+        """Tasa de respuesta, aciertos y tiempo medio hasta el buzzer de una pregunta"""
+        with self.lock:
+            stats = self.questions.get(text)
+            if stats is None:
+                return None
+            return self.describe(stats)
+
+    def totals(self) -> Dict[str, float]:
+        """Las mismas estadisticas sumadas sobre todas las preguntas"""
+        with self.lock:
+            total = [0, 0, 0, 0]
+            for stats in self.questions.values():
+                for i, value in enumerate(stats):
+                    total[i] += value
+            result = self.describe(total)
+            result["matches"] = self.matches
+            return result
+
+    @staticmethod
+    def describe(stats: List[int]) -> Dict[str, float]:
+        asked, answered, correct, buzz_ms = stats
+        return {
+            "asked": asked,
+            "answer_rate": answered / asked if asked else 0.0,
+            "correct_rate": correct / answered if answered else 0.0,
+            "avg_buzz_ms": buzz_ms / answered if answered else 0.0,
+        }
+
+    # Escritura
+
+    def record_match(self, player: int, score: int, won: bool, questions: int,
+                     category_points: Dict[str, int]):
+        """Encola el resultado de un jugador al terminar la partida"""
+        categories = list(category_points.items())[:255]
+        payload = [MATCH.pack(b"M", time.time(), player, won, clamp(score, -32768, 32767),
+                              clamp(questions, 0, 65535), len(categories))]
+        for name, points in categories:
+            encoded = truncate_utf8(name, MAX_NAME)
+            payload.append(MATCH_CATEGORY.pack(clamp(points, -32768, 32767), len(encoded)))
+            payload.append(encoded)
+        self.enqueue(b"".join(payload))
+
+    def record_question(self, text: str, answered: bool, correct: bool, buzz_ms: int):
+        """Encola como termino una pregunta; buzz_ms es el tiempo hasta el buzzer"""
+        encoded = truncate_utf8(text, MAX_TEXT)
+        self.enqueue(QUESTION.pack(b"Q", answered, correct, clamp(buzz_ms, 0, 65535), len(encoded)) + encoded)
+
+    def enqueue(self, payload: bytes):
+        if self.worker is None or not self.worker.is_alive():
+            self.worker = threading.Thread(target=self.work, name="score-writer", daemon=True)
+            self.worker.start()
+        self.requests.put(payload)
+
+    def flush(self):
+        """Espera a que el hilo escriba todo lo encolado (no espera a un hilo muerto)"""
+        if self.worker is None:
+            return
+        with self.requests.all_tasks_done:
+            while self.requests.unfinished_tasks and self.worker.is_alive():
+                self.requests.all_tasks_done.wait(0.1)
+
+    def close(self):
+        """Escribe lo pendiente y actualiza el indice"""
+        if self.worker is not None and self.worker.is_alive():
+            self.requests.put(None)
+            self.worker.join()
+            self.worker = None
+        if self.unindexed:
+            self.checkpoint()
+
+    def work(self):
+        try:
+            log = open(self.path, 'a+b')
+        except OSError as error:
+            print(f"No se pudo abrir {self.path}: {error}")
+            return
+        with log:
+            while True:
+                payload = self.requests.get()
+                batch = [payload]
+                # Se agrupa lo que ya este en la cola para hacer un solo fsync
+                while payload is not None:
+                    try:
+                        payload = self.requests.get_nowait()
+                    except queue.Empty:
+                        break
+                    batch.append(payload)
+
+                records = [record for record in batch if record is not None]
+                try:
+                    if records:
+                        self.append(log, records)
+                    if self.unindexed >= CHECKPOINT_EVERY:
+                        self.checkpoint()
+                except (OSError, struct.error) as error:
+                    # Disco lleno o similar: se pierde este lote, pero el hilo sigue y flush() no se cuelga
+                    print(f"Error al guardar {len(records)} puntajes en {self.path}: {error}")
+                finally:
+                    for _ in batch:
+                        self.requests.task_done()
+                if batch[-1] is None:
+                    return
+
+    def append(self, log: BinaryIO, records: List[bytes]):
+        """Agrega los registros al final del log con el archivo bloqueado"""
+        lock_file(log)
+        try:
+            with self.lock:
+                # Primero lo que otros procesos agregaron desde la ultima vez
+                if self.scan(log) != "end":
+                    self.discard_tail(log)
+            log.seek(0, os.SEEK_END)
+            log.write(b"".join(FRAME.pack(len(record), zlib.crc32(record)) + record for record in records))
+            log.flush()
+            os.fsync(log.fileno())
+            with self.lock:
+                for record in records:
+                    self.apply(record)
+                    self.unindexed += 1
+                self.offset = log.tell()
+        finally:
+            unlock_file(log)
+
+    # Tablas en memoria
+
+    def apply(self, record: bytes):
+        """Aplica un registro del log a las tablas (requiere el lock)"""
+        if record[:1] == b"M":
+            _, when, player, _, score, _, count = MATCH.unpack_from(record)
+            self.insert(OVERALL, (-score, when, player))
+            pos = MATCH.size
+            for _ in range(count):
+                points, size = MATCH_CATEGORY.unpack_from(record, pos)
+                pos += MATCH_CATEGORY.size
+                name = record[pos:pos + size].decode("utf-8", "replace")
+                pos += size
+                self.insert(name, (-points, when, player))
+            self.matches += 1
+        elif record[:1] == b"Q":
+            _, answered, correct, buzz_ms, size = QUESTION.unpack_from(record)
+            text = record[QUESTION.size:QUESTION.size + size].decode("utf-8", "replace")
+            stats = self.questions.get(text)
+            if stats is None:
+                stats = self.questions[text] = [0, 0, 0, 0]
+            stats[0] += 1
+            if answered:
+                stats[1] += 1
+                stats[3] += buzz_ms
+            if correct:
+                stats[2] += 1
+        self.version += 1
+
+    def insert(self, name: str, entry: Entry):
+        board = self.boards.get(name)
+        if board is None:
+            board = self.boards[name] = []
+        if len(board) >= KEEP and entry >= board[-1]:
+            return
+        bisect.insort(board, entry)
+        del board[KEEP:]
+
+    # Indice
+
+    def load(self):
+        """Carga el indice y relee solo la parte del log que no cubre"""
+        indexed = self.load_index()
+        self.indexed_offset = self.offset
+        try:
+            log = open(self.path, 'r+b')
+        except FileNotFoundError:
+            self.reset()
+            return
+        rebuilt = False
+        with log:
+            lock_file(log)
+            size = os.fstat(log.fileno()).st_size
+            if self.offset > size:
+                # El log es mas corto que el indice: se reconstruye todo
+                self.reset()
+                self.indexed_offset = 0
+                rebuilt = indexed
+            if self.scan(log) == "corrupt" and indexed and self.unindexed == 0 and self.offset > 0:
+                # Un registro completo con CRC incorrecto justo en el offset del indice: el
+                # indice no coincide con el log y se relee desde el principio. Uno a medio
+                # escribir ("torn") es solo una cola rota: se corta y el indice sigue valiendo
+                print(f"El indice de {self.path} no coincide con el log; se reconstruye")
+                self.reset()
+                self.scan(log)
+                rebuilt = True
+            if self.offset < size:
+                self.discard_tail(log)
+            unlock_file(log)
+        if rebuilt or self.unindexed >= CHECKPOINT_EVERY:
+            self.checkpoint()
+
+    def reset(self):
+        self.boards, self.questions, self.matches, self.offset = {}, {}, 0, 0
+        self.unindexed = 0
+
+    def scan(self, log: BinaryIO) -> str:
+        """Aplica los registros desde self.offset hasta el final del log.
+
+        Devuelve "end" si llego limpio al final, "torn" si el ultimo
+        registro quedo a medio escribir (llega hasta el final del archivo) o
+        "corrupt" si un registro completo tiene el CRC incorrecto; en los dos
+        ultimos casos self.offset queda al principio de ese registro.
+        """
+        log.seek(self.offset)
+        while True:
+            header = log.read(FRAME.size)
+            if not header:
+                return "end"
+            if len(header) < FRAME.size:
+                return "torn"
+            length, crc = FRAME.unpack(header)
+            record = log.read(length)
+            if len(record) < length:
+                return "torn"
+            if zlib.crc32(record) != crc:
+                return "corrupt"
+            self.apply(record)
+            self.offset = log.tell()
+            self.unindexed += 1
+
+    def discard_tail(self, log: BinaryIO):
+        """Corta un registro a medio escribir (el juego se corto); requiere el archivo bloqueado"""
+        size = os.fstat(log.fileno()).st_size
+        if self.offset < self.indexed_offset:
+            # Lo anterior al indice ya fue leido bien alguna vez: no se corta nada valido
+            print(f"{self.path} esta danado antes del offset del indice; no se modifica")
+            return
+        print(f"Descartando {size - self.offset} bytes danados al final de {self.path}")
+        log.truncate(self.offset)
+
+    def load_index(self) -> bool:
+        try:
+            with open(self.index_path, 'rb') as file:
+                magic, version, offset, size = INDEX_HEADER.unpack(file.read(INDEX_HEADER.size))
+                if magic != INDEX_MAGIC or version != INDEX_VERSION:
+                    return False
+                data = json.loads(file.read(size))
+        except (OSError, ValueError, struct.error):
+            return False
+        self.boards = {name: [tuple(entry) for entry in board] for name, board in data["boards"].items()}
+        self.questions = data["questions"]
+        self.matches = data["matches"]
+        self.offset = offset
+        return True
+
+    def checkpoint(self):
+        """Escribe el indice con el estado actual (reemplazo atomico)"""
+        with self.lock:
+            data = json.dumps({
+                "matches": self.matches,
+                "boards": self.boards,
+                "questions": self.questions,
+            }, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+            offset = self.offset
+            self.unindexed = 0
+        # Cada proceso usa su propio temporal: otro juego puede estar escribiendo el indice
+        tmp_path = f"{self.index_path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, 'wb') as file:
+                file.write(INDEX_HEADER.pack(INDEX_MAGIC, INDEX_VERSION, offset, len(data)))
+                file.write(data)
+            os.replace(tmp_path, self.index_path)
+        except OSError as error:
+            # Sin indice solo se relee mas log al abrir
+            print(f"No se pudo escribir {self.index_path}: {error}")
@@ -0,0 +1,139 @@
+import random
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+class ShuffleBag:
+    """Bolsa de indices sin repeticion (Fisher-Yates incremental).
+
+    Cada draw() es O(1): se elige un indice al azar entre los que quedan y se
+    intercambia al final de la zona disponible. reset() no reserva memoria
+    nueva, solo vuelve a marcar todos los indices como disponibles.
+    """
+
+    def __init__(self, items: List[int], rng: random.Random):
+        self.items = items
+        self.remaining = len(items)
+        self.rng = rng
+
+    def __len__(self) -> int:
+        return self.remaining
+
+    def draw(self) -> Optional[int]:
+        if self.remaining == 0:
+            return None
+        j = self.rng.randrange(self.remaining)
+        last = self.remaining - 1
+        self.items[j], self.items[last] = self.items[last], self.items[j]
+        self.remaining = last
+        return self.items[last]
+
+    def undo(self):
+        """Devuelve a la bolsa el ultimo indice sacado"""
+        if self.remaining < len(self.items):
+            self.remaining += 1
+
+    def reset(self):
+        self.remaining = len(self.items)
+
+
+class QuestionSelector:
+    """Selecciona indices de preguntas sin repetir, agrupadas por categoria.
+
+    Las preguntas se identifican por su posicion en el banco; el selector solo
+    necesita la categoria de cada una. Por defecto todas las preguntas tienen
+    la misma probabilidad; set_weights() cambia la mezcla de categorias y
+    set_categories() limita el juego a algunas de ellas.
+    """
+
+    def __init__(self, categories: Iterable[str], rng: Optional[random.Random] = None):
+        self.rng = rng or random.Random()
+        indices: Dict[str, List[int]] = {}
+        for i, category in enumerate(categories):
+            indices.setdefault(category, []).append(i)
+        self.pools: Dict[str, ShuffleBag] = {c: ShuffleBag(items, self.rng) for c, items in indices.items()}
+        self.weights: Dict[str, float] = {}
+        self.active: List[str] = list(self.pools)
+        # (categoria, indice) ya sacado por peek() y pendiente de entregar
+        self.upcoming: Optional[Tuple[str, int]] = None
+
+    def copy(self, rng: Optional[random.Random] = None) -> "QuestionSelector":
+        """Selector nuevo sobre el mismo banco sin volver a leer las categorias"""
+        clone = QuestionSelector((), rng)
+        clone.pools = {c: ShuffleBag(list(bag.items), clone.rng) for c, bag in self.pools.items()}
+        clone.weights = dict(self.weights)
+        clone.active = list(self.active)
+        return clone
+
+    @property
+    def categories(self) -> List[str]:
+        return list(self.pools)
+
+    def set_categories(self, categories: Optional[Iterable[str]]):
+        """Limita la seleccion a esas categorias (None para usar todas)"""
+        if categories is None:
+            self.active = list(self.pools)
+        else:
+            self.active = [c for c in categories if c in self.pools]
+        self.return_upcoming()
+
+    def set_weights(self, weights: Optional[Dict[str, float]]):
+        """Peso relativo de cada categoria; las que no aparecen pesan lo que su tamaño"""
+        self.weights = dict(weights or {})
+        self.return_upcoming()
+
+    def return_upcoming(self):
+        """Devuelve a su bolsa la pregunta reservada por peek()"""
+        if self.upcoming is not None:
+            self.pools[self.upcoming[0]].undo()
+            self.upcoming = None
+
+    def remaining(self) -> int:
+        return sum(len(self.pools[c]) for c in self.active) + (self.upcoming is not None)
+
+    def exhausted(self) -> bool:
+        return self.remaining() == 0
+
+    def pick_category(self) -> Optional[str]:
+        total = 0.0
+        candidates = []
+        for category in self.active:
+            left = len(self.pools[category])
+            if left:
+                weight = self.weights.get(category, left)
+                if weight > 0:
+                    total += weight
+                    candidates.append((category, weight))
+        if not candidates:
+            return None
+        r = self.rng.random() * total
+        for category, weight in candidates:
+            r -= weight
+            if r < 0:
+                return category
+        return candidates[-1][0]
+
+    def draw(self) -> Optional[int]:
+        """Devuelve el indice de la siguiente pregunta, o None si no quedan"""
+        if self.upcoming is not None:
+            _, index = self.upcoming
+            self.upcoming = None
+            return index
+        category = self.pick_category()
+        if category is None:
+            return None
+        return self.pools[category].draw()
+
+    def peek(self) -> Optional[int]:
+        """Indice que devolvera el proximo draw() (para precargar su imagen)"""
+        if self.upcoming is None:
+            category = self.pick_category()
+            if category is None:
+                return None
+            self.upcoming = (category, self.pools[category].draw())
+        return self.upcoming[1]
+
+    def reset(self):
+        """Vuelve a poner todas las preguntas en juego"""
+        for pool in self.pools.values():
+            pool.reset()
+        self.upcoming = None
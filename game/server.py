@@ -0,0 +1,221 @@
+"""Servidor de partidas: muchas sesiones sin ventana repartidas en procesos.
+
+    python server.py                             # localhost:8765, un proceso por CPU
+    python server.py --port 9000 --workers 4 --questions banco.JSON
+
+Protocolo: una linea JSON por mensaje en cada sentido. Pedidos:
+
+    {"op": "new", "seed": 1}                     -> crea una sesion
+    {"op": "buzz", "session": 1, "player": 1}
+    {"op": "answer", "session": 1, "answer": "Paris"}
+    {"op": "state", "session": 1}
+    {"op": "close", "session": 1}
+
+Cada respuesta trae "ok" y el estado publico de la sesion (GameSession.snapshot),
+o "error" si el pedido no es valido. Las sesiones pertenecen a la conexion que
+las creo; el tiempo de juego avanza con el reloj real entre pedidos.
+"""
+import os
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import random
+import signal
+import socket
+import sys
+import time
+from typing import Dict, List, Optional
+
+from game_clock import GameClock
+from question_store import QuestionStore
+from selection import QuestionSelector
+from session import GameSession
+
+DEFAULT_PORT = 8765
+
+
+class ServerSession:
+    """Una partida del servidor con su propio reloj de paso fijo"""
+
+    def __init__(self, session: GameSession):
+        self.session = session
+        self.clock = GameClock()
+        self.last_ms = time.monotonic() * 1000
+
+    def sync(self):
+        """Avanza la partida el tiempo real pasado desde el ultimo pedido"""
+        elapsed = int(time.monotonic() * 1000 - self.last_ms)
+        # La fraccion de milisegundo que sobra queda para el proximo pedido
+        self.last_ms += elapsed
+        self.session.advance(self.clock, elapsed)
+
+
+def is_int(value) -> bool:
+    # bool es subclase de int, pero true no es un id ni una semilla valida
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+class SessionHost:
+    """Sesiones de un proceso del servidor, sobre un unico banco de preguntas.
+
+    El banco y el selector base se abren una sola vez por proceso; cada
+    sesion nueva copia el selector (solo listas de indices), asi crear una
+    partida no vuelve a leer el banco.
+    """
+
+    def __init__(self, questions_path: str):
+        self.questions = QuestionStore(questions_path)
+        self.selector = QuestionSelector(self.questions.iter_categories())
+        self.next_id = 1
+
+    def new_session(self, seed: Optional[int] = None) -> ServerSession:
+        rng = random.Random(seed)
+        game = GameSession(self.questions, self.selector.copy(rng))
+        game.select_random_question()
+        return ServerSession(game)
+
+    def handle(self, request: Dict, sessions: Dict[int, ServerSession]) -> Dict:
+        """Atiende un pedido de una conexion y devuelve la respuesta"""
+        op = request.get("op")
+        if op == "new":
+            seed = request.get("seed")
+            if seed is not None and not is_int(seed):
+                return {"ok": False, "error": f"Semilla invalida: {seed!r}"}
+            session_id = self.next_id
+            self.next_id += 1
+            sessions[session_id] = self.new_session(seed)
+            return self.reply(session_id, sessions[session_id])
+
+        session_id = request.get("session")
+        if not is_int(session_id):
+            return {"ok": False, "error": f"Sesion invalida: {session_id!r}"}
+        server_session = sessions.get(session_id)
+        if server_session is None:
+            return {"ok": False, "error": f"Sesion desconocida: {session_id}"}
+        server_session.sync()
+        game = server_session.session
+
+        if op == "buzz":
+            player = request.get("player")
+            if player not in (1, 2):
+                return {"ok": False, "error": f"Jugador invalido: {player}"}
+            response = self.reply(session_id, server_session)
+            response["accepted"] = game.buzz(player)
+            response["player"] = game.current_player
+            return response
+        if op == "answer":
+            correct = game.answer(str(request.get("answer", "")))
+            response = self.reply(session_id, server_session)
+            response["correct"] = correct
+            return response
+        if op == "state":
+            return self.reply(session_id, server_session)
+        if op == "close":
+            del sessions[session_id]
+            return self.reply(session_id, server_session)
+        return {"ok": False, "error": f"Operacion desconocida: {op}"}
+
+    def reply(self, session_id: int, server_session: ServerSession) -> Dict:
+        response = server_session.session.snapshot()
+        response["ok"] = True
+        response["session"] = session_id
+        return response
+
+    async def serve_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        sessions: Dict[int, ServerSession] = {}
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                    if not isinstance(request, dict):
+                        raise ValueError("se esperaba un objeto")
+                    response = self.handle(request, sessions)
+                except (TypeError, ValueError) as error:
+                    # Un campo con un tipo inesperado no debe cortar la conexion (y sus sesiones)
+                    response = {"ok": False, "error": f"Pedido invalido: {error}"}
+                writer.write(json.dumps(response, ensure_ascii=False).encode("utf-8") + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+
+def listen(host: str, port: int) -> socket.socket:
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(1024)
+    sock.setblocking(False)
+    return sock
+
+
+def serve(sock: socket.socket, questions_path: str):
+    """Corre un proceso del servidor sobre el socket compartido"""
+    host = SessionHost(questions_path)
+
+    async def main():
+        server = await asyncio.start_server(host.serve_client, sock=sock)
+        async with server:
+            await server.serve_forever()
+
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
+
+
+def run_server(host: str, port: int, workers: int, questions_path: str):
+    """Abre el socket y reparte las conexiones entre `workers` procesos"""
+    # El indice se construye antes de crear los procesos para no hacerlo N veces
+    QuestionStore(questions_path).close()
+    sock = listen(host, port)
+    print(f"Servidor en {host}:{sock.getsockname()[1]} con {workers} procesos", flush=True)
+
+    if workers <= 1 or "fork" not in multiprocessing.get_all_start_methods():
+        serve(sock, questions_path)
+        return
+
+    # Todos los procesos aceptan conexiones del mismo socket (modelo pre-fork)
+    context = multiprocessing.get_context("fork")
+    processes: List[multiprocessing.Process] = [
+        context.Process(target=serve, args=(sock, questions_path), daemon=True)
+        for _ in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    # Al recibir SIGTERM el proceso principal cierra tambien a los trabajadores
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    try:
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for process in processes:
+            process.terminate()
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--questions", default="questions.JSON")
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.questions):
+        print(f"No se encuentra el archivo '{args.questions}'")
+        return
+    run_server(args.host, args.port, args.workers, args.questions)
+
+
+if __name__ == "__main__":
+    main()
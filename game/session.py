@@ -0,0 +1,224 @@
+import random
+from typing import Dict, Optional
+
+from game_clock import GameClock
+from scores import ScoreStore
+from selection import QuestionSelector
+
+# Tiempos del juego en milisegundos (independientes de los FPS)
+QUESTION_TIME_MS = 5000
+ANNOUNCEMENT_MS = 2000
+FEEDBACK_MS = 500
+# Una respuesta incorrecta resta puntos si se tocó el buzzer con al menos este tiempo restante
+PENALTY_TIME_MS = 3500
+# Puntaje con el que se gana la partida
+WIN_SCORE = 20
+CORRECT_POINTS = 10
+PENALTY_POINTS = 5
+
+
+class GameSession:
+    """Reglas de una partida, sin nada de pygame.
+
+    Contiene la seleccion de preguntas, el puntaje de check_answer, la
+    condicion de victoria y los temporizadores. Game la extiende para
+    dibujar; el servidor (server.py) la usa tal cual para correr muchas
+    partidas sin ventana.
+    """
+
+    def __init__(self, questions, selector: Optional[QuestionSelector] = None,
+                 rng: Optional[random.Random] = None, scores: Optional[ScoreStore] = None):
+        # Tabla de puntajes donde se guardan las partidas terminadas (opcional)
+        self.scores = scores
+        self.rng = rng
+        self.set_questions(questions, selector)
+        self.selected_questions = []
+        self.current_question = None
+        self.bank_exhausted = False
+
+        # Timer
+        self.timer = QUESTION_TIME_MS
+        self.current_time = self.timer
+        self.timer_active = False  # Nueva variable para controlar el timer
+        self.buzz_time = 0  # tiempo restante cuando se tocó el buzzer
+        self.answered = None  # None mientras nadie responda la pregunta actual
+
+        # Jugadores
+        self.player1_score = 0
+        self.player2_score = 0
+        self.current_player = None
+        self.show_turn_announcement = False
+        self.announcement_timer = 0
+        # Puntos de cada jugador por categoria en esta partida
+        self.category_points: Dict[int, Dict[str, int]] = {1: {}, 2: {}}
+
+        # Mensaje de retroalimentación
+        self.feedback_message = ""
+        self.feedback_correct = False
+        self.feedback_timer = 0
+
+        # Estado del juego
+        self.game_state = "playing"
+        self.winner = None
+
+    def set_questions(self, questions, selector: Optional[QuestionSelector] = None):
+        """Cambia el banco de preguntas (y el selector que sortea sobre el)"""
+        self.questions = questions
+        if selector is None:
+            selector = QuestionSelector(questions.iter_categories() if questions else [], self.rng)
+        self.selector = selector
+
+    def on_question_changed(self):
+        """Se llama cada vez que cambia la pregunta actual"""
+
+    def select_random_question(self):
+        """Selecciona una pregunta aleatoria"""
+        self.record_question()
+        index = self.selector.draw()
+        if index is None:
+            # Se agotó el banco: la partida termina con el marcador actual
+            self.bank_exhausted = True
+            self.current_question = None
+            self.finish_game()
+            return
+        self.current_question = self.questions[index]
+        self.selected_questions.append(self.current_question)
+        self.answered = None
+        self.current_time = self.timer
+        self.current_player = None
+        self.show_turn_announcement = False
+        self.timer_active = False  # El timer se detiene al cambiar la pregunta
+        self.on_question_changed()
+
+    def buzz(self, player: int) -> bool:
+        """El jugador toca el buzzer; solo cuenta si nadie tiene el turno"""
+        if self.game_state != "playing" or self.current_player is not None:
+            return False
+        self.current_player = player
+        self.show_turn_announcement = True
+        self.announcement_timer = ANNOUNCEMENT_MS
+        self.timer_active = True  # Activar el timer cuando el jugador toma su turno
+        self.buzz_time = self.current_time
+        return True
+
+    def show_feedback(self, is_correct: bool):
+        """Muestra mensaje de retroalimentación"""
+        self.feedback_message = "¡Correcto!" if is_correct else "Incorrecto"
+        self.feedback_correct = is_correct
+        self.feedback_timer = FEEDBACK_MS  # Mostrar por medio segundo
+
+    def add_points(self, points: int):
+        """Suma (o resta) puntos al jugador que tiene el turno"""
+        if self.current_player == 1:
+            self.player1_score += points
+        else:
+            self.player2_score += points
+        if self.current_question:
+            player_points = self.category_points[1 if self.current_player == 1 else 2]
+            category = self.current_question.category
+            player_points[category] = player_points.get(category, 0) + points
+
+    def check_answer(self, answer: str, tiempo) -> bool:
+        """Verifica si la respuesta es correcta"""
+        if self.current_question and answer == self.current_question.correct_answer:
+            self.add_points(CORRECT_POINTS)
+            self.answered = True
+            self.show_feedback(True)
+            return True
+        else:
+            if tiempo >= PENALTY_TIME_MS:
+                self.add_points(-PENALTY_POINTS)
+
+        self.answered = False
+        self.show_feedback(False)
+        return False
+
+    def answer(self, answer: str) -> Optional[bool]:
+        """Responde la pregunta actual; None si nadie tiene el turno"""
+        if self.game_state != "playing" or self.current_player is None:
+            return None
+        correct = self.check_answer(answer, self.buzz_time)
+
+        # Verificar si alguien ganó
+        if self.player1_score >= WIN_SCORE or self.player2_score >= WIN_SCORE:
+            self.finish_game()
+        else:
+            self.select_random_question()
+        return correct
+
+    def finish_game(self):
+        """Termina la partida y decide el ganador"""
+        self.record_question()
+        self.game_state = "game_over"
+        if self.player1_score > self.player2_score:
+            self.winner = 1
+        elif self.player2_score > self.player1_score:
+            self.winner = 2
+        else:
+            self.winner = None
+        if self.scores is not None:
+            asked = len(self.selected_questions)
+            for player, score in ((1, self.player1_score), (2, self.player2_score)):
+                self.scores.record_match(player, score, self.winner == player, asked,
+                                         self.category_points[player])
+
+    def record_question(self):
+        """Guarda en la tabla de puntajes como termino la pregunta actual"""
+        if self.scores is None or self.current_question is None or self.game_state != "playing":
+            return
+        answered = self.answered is not None
+        buzz_ms = self.timer - self.buzz_time if answered else 0
+        self.scores.record_question(self.current_question.question, answered, bool(self.answered), buzz_ms)
+
+    def update(self, dt_ms: int):
+        """Avanza los temporizadores del juego dt_ms milisegundos"""
+        # Solo actualizar el timer si está activo
+        #if self.timer_active:
+        self.current_time -= dt_ms
+        if self.current_time <= 0:
+            self.select_random_question()
+
+        # Actualizar tiempo de anuncio
+        if self.show_turn_announcement:
+            self.announcement_timer -= dt_ms
+            if self.announcement_timer <= 0:
+                self.show_turn_announcement = False
+
+        # Actualizar timer de feedback
+        if self.feedback_timer > 0:
+            self.feedback_timer -= dt_ms
+
+    def advance(self, clock: GameClock, elapsed_ms: int):
+        """Avanza la partida elapsed_ms en pasos fijos del reloj"""
+        for _ in range(clock.advance(elapsed_ms)):
+            if self.game_state != "playing":
+                break
+            self.update(clock.step_ms)
+
+    def reset_game(self):
+        """Reinicia el juego"""
+        self.player1_score = 0
+        self.player2_score = 0
+        self.current_player = None
+        self.game_state = "playing"
+        self.winner = None
+        self.bank_exhausted = False
+        self.selected_questions = []
+        self.current_question = None
+        self.category_points = {1: {}, 2: {}}
+        self.selector.reset()
+
+    def snapshot(self) -> Dict:
+        """Estado publico de la partida (sin la respuesta correcta)"""
+        question = self.current_question
+        return {
+            "state": self.game_state,
+            "scores": [self.player1_score, self.player2_score],
+            "player": self.current_player,
+            "question": question.question if question else None,
+            "category": question.category if question else None,
+            "options": list(question.options) if question else [],
+            "time_left_ms": self.current_time,
+            "asked": len(self.selected_questions),
+            "winner": self.winner,
+        }
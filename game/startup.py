@@ -0,0 +1,77 @@
+"""Tiempo de arranque del juego, medido desde que se lanza el proceso.
+
+    python startup.py                            # 5 arranques sin ventana
+    python startup.py --runs 10 --questions banco.JSON --window
+
+Lanza gui.py varias veces con QUIZ_STARTUP_REPORT apuntando a un archivo
+temporal; el juego anota ahi cuando dibuja el primer cuadro del menu y
+cuando el banco de preguntas queda listo. Se informa la mediana y el peor
+de cada uno.
+"""
+import os
+import sys
+import time
+
+REPORT_ENV = "QUIZ_STARTUP_REPORT"
+
+
+def mark_startup(name: str):
+    """Anota un hito del arranque si el juego corre bajo startup.py"""
+    path = os.environ.get(REPORT_ENV)
+    if path:
+        with open(path, 'a', encoding='utf-8') as file:
+            file.write(f"{name} {time.time()}\n")
+
+
+def measure(questions: str, window: bool, timeout: float = 60.0) -> dict:
+    """Lanza el juego una vez y devuelve los milisegundos hasta cada hito"""
+    import subprocess
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as tmp:
+        report = os.path.join(tmp, "startup.txt")
+        env = dict(os.environ, QUIZ_QUESTIONS=questions, PYGAME_HIDE_SUPPORT_PROMPT="1")
+        env[REPORT_ENV] = report
+        if not window:
+            env.setdefault("SDL_VIDEODRIVER", "dummy")
+            env.setdefault("SDL_AUDIODRIVER", "dummy")
+
+        gui = os.path.join(os.path.dirname(os.path.abspath(__file__)), "gui.py")
+        start = time.time()
+        process = subprocess.Popen([sys.executable, gui], env=env, stdout=subprocess.DEVNULL)
+        marks = {}
+        try:
+            while len(marks) < 2 and time.time() - start < timeout and process.poll() is None:
+                time.sleep(0.005)
+                if os.path.exists(report):
+                    with open(report, encoding='utf-8') as file:
+                        for line in file:
+                            name, when = line.split()
+                            marks[name] = (float(when) - start) * 1000
+        finally:
+            process.terminate()
+            process.wait()
+    return marks
+
+
+def main(argv=None):
+    import argparse
+    import statistics
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--questions", default="questions.JSON")
+    parser.add_argument("--window", action="store_true", help="abre la ventana real en lugar del driver dummy")
+    args = parser.parse_args(argv)
+
+    runs = [measure(args.questions, args.window) for _ in range(args.runs)]
+    for name, title in (("first_frame", "primer cuadro"), ("bank_ready", "banco listo")):
+        values = [run[name] for run in runs if name in run]
+        if not values:
+            print(f"{title:>14}: no se alcanzo")
+            continue
+        print(f"{title:>14}: mediana {statistics.median(values):7.1f} ms   peor {max(values):7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
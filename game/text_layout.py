@@ -0,0 +1,127 @@
+import pygame
+from collections import OrderedDict
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from fonts import font_cache
+
+
+class TextStyle(NamedTuple):
+    """Fuente y rango de tamaños con los que se ajusta un texto"""
+    path: Optional[str]
+    size: int
+    min_size: int = 10
+    line_spacing: int = 2
+
+
+def wrap(font: pygame.font.Font, text: str, width: int) -> List[str]:
+    """Parte el texto en lineas que entran en width, midiendo con Font.size"""
+    lines: List[str] = []
+    for paragraph in text.split("\n"):
+        line = ""
+        for word in paragraph.split():
+            candidate = f"{line} {word}" if line else word
+            if font.size(candidate)[0] <= width:
+                line = candidate
+                continue
+            if line:
+                lines.append(line)
+            # Una palabra mas ancha que la caja se corta por caracteres
+            while font.size(word)[0] > width and len(word) > 1:
+                cut = len(word) - 1
+                while cut > 1 and font.size(word[:cut])[0] > width:
+                    cut -= 1
+                lines.append(word[:cut])
+                word = word[cut:]
+            line = word
+        lines.append(line)
+    return lines
+
+
+class TextLayout:
+    """Ajusta textos a un rectangulo y guarda el resultado ya renderizado.
+
+    fit() busca (binariamente) el mayor tamaño de fuente con el que el texto
+    entra, midiendo con Font.size sin renderizar nada; las fuentes salen de
+    font_cache, asi que cada tamaño se carga una sola vez. render() dibuja
+    las lineas una vez y guarda la Surface por (texto, tamaño, estilo,
+    color) en una cache LRU; las Surfaces devueltas no deben modificarse.
+    El ajuste se guarda aparte, asi cada color del mismo texto no lo repite.
+    """
+
+    def __init__(self, max_entries: int = 64):
+        self.max_entries = max_entries
+        self.surfaces: "OrderedDict[tuple, pygame.Surface]" = OrderedDict()
+        # Lineas ya ajustadas por (texto, tamaño, estilo): los colores de un mismo texto las comparten
+        self.layouts: "OrderedDict[tuple, Tuple[pygame.font.Font, List[str]]]" = OrderedDict()
+
+        # Contadores
+        self.hits = 0
+        self.misses = 0
+
+    def fits(self, font: pygame.font.Font, lines: List[str], size: Tuple[int, int], style: TextStyle) -> bool:
+        width, height = size
+        total = len(lines) * font.get_linesize() + (len(lines) - 1) * style.line_spacing
+        return total <= height and all(font.size(line)[0] <= width for line in lines)
+
+    def fit(self, text: str, size: Tuple[int, int], style: TextStyle) -> Tuple[pygame.font.Font, List[str]]:
+        """Mayor tamaño de fuente con el que el texto entra en size, y sus lineas"""
+        low, high = style.min_size, max(style.min_size, style.size)
+        best = None
+        while low <= high:
+            middle = (low + high) // 2
+            font = font_cache.get_font(style.path, middle)
+            lines = wrap(font, text, size[0])
+            if self.fits(font, lines, size, style):
+                best = (font, lines)
+                low = middle + 1
+            else:
+                high = middle - 1
+        if best is None:
+            # Ni con el tamaño minimo entra: se recortan las lineas que sobran
+            font = font_cache.get_font(style.path, style.min_size)
+            lines = wrap(font, text, size[0])
+            rows = max(1, (size[1] + style.line_spacing) // (font.get_linesize() + style.line_spacing))
+            best = (font, lines[:rows])
+        return best
+
+    def render(self, text: str, size: Tuple[int, int], style: TextStyle, color) -> pygame.Surface:
+        """Texto ajustado a size, con las lineas centradas (del alto justo del texto)"""
+        key = (text, size, style, color)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        layout_key = (text, size, style)
+        layout = self.layouts.get(layout_key)
+        if layout is None:
+            layout = self.layouts[layout_key] = self.fit(text, size, style)
+            if len(self.layouts) > self.max_entries:
+                self.layouts.popitem(last=False)
+        font, lines = layout
+        rendered = [font.render(line, True, color) for line in lines]
+        width = max((line.get_width() for line in rendered), default=0)
+        step = font.get_linesize() + style.line_spacing
+        surface = pygame.Surface((max(1, width), max(1, len(rendered) * step - style.line_spacing)), pygame.SRCALPHA)
+        for i, line in enumerate(rendered):
+            surface.blit(line, line.get_rect(centerx=width // 2, top=i * step))
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert_alpha()
+
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.max_entries:
+            self.surfaces.popitem(last=False)
+        return surface
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "layouts": len(self.surfaces)}
+
+    def clear(self):
+        self.surfaces.clear()
+        self.layouts.clear()
+
+
+# Cache compartida por todo el proceso
+text_layout = TextLayout()